@@ -0,0 +1,25 @@
+import asyncio
+import importlib
+from types import ModuleType
+from typing import Optional
+
+# backend.agents pulls in LangGraph, LangChain and the Gemini SDK and builds
+# the graph, the LLM cache and the gateway at import, which takes over a
+# second. The API imports it through here instead, on a worker thread, the
+# first time it is needed (or from the startup warm-up), so the server can
+# answer requests that do not touch the agents right away.
+
+_agents: Optional[ModuleType] = None
+
+
+async def load_agents() -> ModuleType:
+    global _agents
+    if _agents is None:
+        # Concurrent first calls each start a thread; the import lock makes
+        # all but the first wait for it and get the same module.
+        _agents = await asyncio.to_thread(importlib.import_module, "backend.agents")
+    return _agents
+
+
+def agents_loaded() -> bool:
+    return _agents is not None
@@ -1,13 +1,42 @@
+import asyncio
 import json
-from typing import TypedDict
+import logging
+import os
+from typing import Optional, TypedDict
 from langgraph.graph import StateGraph, END
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
+
+from backend.llm_cache import cache_from_env
+from backend.jd_index import jd_index_from_env
+from backend.jd_normalizer import normalize_job_description
+from backend.llm_gateway import gateway_from_env
+from backend.metrics import JD_INDEX_LOOKUPS
+from backend.pdf_pool import PDFPoolBusy, PDFRenderTimeout, shared_pool
+from backend.profile_store import compact_json
+from backend.relevance import build_requirement_map, index_for, prune_profile
+from backend.resume_sections import (
+    GLOBAL_ISSUE_CODES, flagged_spans, resolve_key, section_keys, span_text, splice, split_resume,
+)
+from backend.resume_validator import revision_instructions, validate_resume
+
+# Node progress and intermediate outputs are logged at DEBUG level only.
+logger = logging.getLogger(__name__)
 
 # Define State
 class AgentState(TypedDict, total=False):
     job_description: str
+    # The profile is passed per run in config["configurable"]["profile"] and
+    # filled in by _with_profile, so checkpoints only store its version.
     profile: dict
+    profile_json: str
+    profile_version: str
+    # Set when a near-duplicate JD's analysis was reused: {id, similarity, reused}
+    jd_reuse: dict
+    # "llm" (Experience Matcher prompt) or "local" (BM25 ranking, no LLM call)
+    match_mode: str
+    # Profile serialization for the writers and critic, pruned to top entries
+    prompt_profile_json: str
     target_persona: dict
     requirement_map: dict
     reviewer_instructions: str
@@ -15,16 +44,64 @@ class AgentState(TypedDict, total=False):
     critique: dict
     review_rounds: int
     best_resume_markdown: str
-    best_cover_letter_text: str
     best_match_score: int
     resume_markdown: str
+    # First-draft alternatives when RESUME_CANDIDATES > 1; the first review
+    # keeps the best one as resume_markdown and clears the list.
+    resume_candidates: list[str]
     cover_letter_text: str
 
-# Initialize LLM (Ensure OPENAI_API_KEY is found in env)
-# For demo purposes, we assume it's set or will be set.
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash")
-
-def _safe_json_loads(text: str) -> dict:
+# Experience mapping: "llm" asks the Experience Matcher, "local" ranks profile
+# entries against the JD with BM25 and skips that LLM call entirely. A run's
+# match_mode (the match_mode field of /api/v1/generate) overrides this.
+EXPERIENCE_MATCH_MODE = os.getenv("EXPERIENCE_MATCH_MODE", "llm")
+# When > 0, the writers and critic only see this many top-ranked projects.
+PROFILE_PRUNE_TOP_K = int(os.getenv("PROFILE_PRUNE_TOP_K", "0"))
+
+# Local pre-critic: drafts scoring at or above PASS, or at or below FAIL, are
+# judged by the rule-based validator alone and skip the LLM critic. Drafts in
+# between go to the LLM with the validator's findings attached.
+PRECRITIC_ENABLED = os.getenv("PRECRITIC_ENABLED", "true").lower() not in ("0", "false", "no")
+PRECRITIC_PASS_SCORE = int(os.getenv("PRECRITIC_PASS_SCORE", "100"))
+PRECRITIC_FAIL_SCORE = int(os.getenv("PRECRITIC_FAIL_SCORE", "55"))
+
+# Speculative drafting: when > 1, the first resume draft is written this many
+# times concurrently (each with its own emphasis and temperature), all drafts
+# are graded in one batched critic call and the best one is kept.
+RESUME_CANDIDATES = int(os.getenv("RESUME_CANDIDATES", "1"))
+RESUME_CANDIDATE_TEMPERATURES = [
+    float(t) for t in os.getenv("RESUME_CANDIDATE_TEMPERATURES", "0.4,0.7,1.0").split(",") if t.strip()
+]
+
+# The JD is stripped of boilerplate (EEO, benefits, application notes) before
+# any prompt sees it.
+JD_NORMALIZE_ENABLED = os.getenv("JD_NORMALIZE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+# Revision rounds rewrite only the sections the critique flagged, unless those
+# make up more than this share of the resume (0 always rewrites it whole).
+PARTIAL_REVISION_MAX_SHARE = float(os.getenv("PARTIAL_REVISION_MAX_SHARE", "0.6"))
+
+# Responses are cached on disk keyed by model, params and rendered prompt, so
+# resubmitting the same JD does not pay for the same Gemini calls again.
+llm_cache = cache_from_env()
+
+# Persona and requirement map of JDs analysed before, so reposted or
+# near-identical listings skip analyze_jd and the Experience Matcher.
+jd_index = jd_index_from_env()
+
+# Gemini clients are handed out per node by the gateway, which rate-limits
+# requests and tokens per model, retries transient errors and picks the
+# model tier for each node (see backend/llm_gateway.py).
+llm_gateway = gateway_from_env(llm_cache)
+
+# When set, every node uses this chat model instead of the gateway's
+# (tests and benchmarks plug a fake model in here).
+llm = None
+
+def _llm(node: str):
+    return llm if llm is not None else llm_gateway.for_node(node)
+
+def _strip_code_fences(text: str) -> str:
     cleaned = text.strip()
     if cleaned.startswith("```"):
         lines = cleaned.splitlines()
@@ -33,6 +110,10 @@ def _safe_json_loads(text: str) -> dict:
         if lines and lines[-1].strip().startswith("```"):
             lines = lines[:-1]
         cleaned = "\n".join(lines).strip()
+    return cleaned
+
+def _safe_json_loads(text: str) -> dict:
+    cleaned = _strip_code_fences(text)
     if "{" in cleaned and "}" in cleaned:
         start = cleaned.find("{")
         end = cleaned.rfind("}")
@@ -42,6 +123,20 @@ def _safe_json_loads(text: str) -> dict:
     except json.JSONDecodeError:
         return {"raw": text}
 
+def _with_profile(state: AgentState, config: Optional[RunnableConfig]) -> AgentState:
+    """The state with profile and profile_json taken from the run's ProfileSnapshot, if the config carries one."""
+    profile = ((config or {}).get("configurable") or {}).get("profile")
+    if profile is None:
+        return state
+    return {**state, "profile": profile.data, "profile_json": profile.prompt_json}
+
+def _profile_json(state: AgentState) -> str:
+    # Callers normally pass the ProfileStore's precomputed serialization.
+    return state.get("profile_json") or compact_json(state["profile"])
+
+def _prompt_profile_json(state: AgentState) -> str:
+    return state.get("prompt_profile_json") or _profile_json(state)
+
 # --- Prompts ---
 
 JD_STRATEGIST_PROMPT = """
@@ -71,7 +166,7 @@ You are the **Experience Matcher**. You are a career strategist mapping a candid
 
 **Rules:**
 1) **Strategic Selection:** Choose the most relevant 5-7 entries total (works and projects).
-2} **Work Experience**: Include all work experience but prioritize those that align with the JD. For example, if the JD emphasizes "real-time data pipelines," prioritize the Finz internship and related projects.
+2) **Work Experience**: Include all work experience but prioritize those that align with the JD. For example, if the JD emphasizes "real-time data pipelines," prioritize the Finz internship and related projects.
 3) **Technical Mapping:** Map specific accomplishments to JD requirements.
 4) **Conciseness:** Keep each "reasoning" to one short sentence.
 5) **No Hallucinations:** Use ONLY the facts provided in the Master Profile.
@@ -168,6 +263,12 @@ You are the **Quality Critic**. Grade this resume based on US Technical Recruitm
 **Scoring:**
 - Match Score (0-100).
 - If score < 80, you MUST provide "Revision Instructions" to the Ghostwriter.
+- Under "flagged_sections", list each section that needs changes by its exact id from **Resume Sections**, with what to change there. Leave it empty only if the whole resume must be restructured.
+
+**Resume Sections:** {section_keys}
+
+**Automated Checks (verified locally, treat as facts and address each in your instructions):**
+{validator_findings}
 
 **Draft Resume:** {resume_markdown}
 **Target Persona:** {target_persona_json}
@@ -177,88 +278,424 @@ You are the **Quality Critic**. Grade this resume based on US Technical Recruitm
 {{
   "match_score": 0,
   "issues_found": [],
-  "revision_instructions": "e.g., 'The Finz intern bullets are too long. Shorten and add a metric for the Kafka pipeline.'"
+  "revision_instructions": "e.g., 'The Finz intern bullets are too long. Shorten and add a metric for the Kafka pipeline.'",
+  "flagged_sections": [
+    {{"section": "Work Experience > AI Engineering Intern at Finz", "instruction": "Shorten the bullets and add a metric for the Kafka pipeline."}}
+  ]
+}}
+"""
+
+QUALITY_CRITIC_BATCH_PROMPT = """
+You are the **Quality Critic**. Grade each of these {candidate_count} alternative drafts of the same resume on its own, based on US Technical Recruitment standards.
+
+**Checklist (apply to every candidate):**
+1. **One-Page Rule:** Is the content concise enough to fit on one physical page?
+2. **XYZ Formula:** Does every bullet point contain a metric and a specific technology?
+3. **Hallucination Check:** Did the writer add any skills (e.g., "Kubernetes") that are NOT in the Master Profile?.
+4. **Visual Check:** Are the dates right-aligned? Is the tech stack line distinct? Are there any typos like "PriceSentiment"?
+
+**Scoring:**
+- Match Score (0-100) per candidate. Score each draft on its merits; do not force a spread.
+- If a score is < 80, you MUST provide "Revision Instructions" for that candidate.
+- Under "flagged_sections", list each section of that candidate that needs changes by its exact id from its **Resume Sections**, with what to change there.
+
+**Target Persona:** {target_persona_json}
+**Profile json:** {profile_json}
+
+**Candidate Resumes:**
+{candidates}
+
+**Output (JSON only), one review per candidate:**
+{{
+  "reviews": [
+    {{
+      "candidate": 1,
+      "match_score": 0,
+      "issues_found": [],
+      "revision_instructions": "",
+      "flagged_sections": [
+        {{"section": "Work Experience > AI Engineering Intern at Finz", "instruction": "Shorten the bullets."}}
+      ]
+    }}
+  ]
 }}
 """
 
+SECTION_REWRITER_PROMPT = """
+You are the **Resume Section Editor**. Revise ONE part of a one-page Markdown resume; the rest of the resume stays as it is.
+
+**Rules:**
+1) Apply the reviewer's instructions to this part only. Keep everything that is not criticized.
+2) Keep the same Markdown structure: `## Section` / `### **Role at Company** <span>Dates</span>` headings, `*Location*` line, blank line, then "-" bullets.
+3) Max 3 bullets per work entry, 2 per project. One line each (~18 words). Use metrics only if they are in the Master Profile.
+4) **No Hallucinations:** Use ONLY facts and skills from the Master Profile.
+
+**Reviewer Instructions:** {instruction}
+
+**Requirement Map:** {requirement_map_json}
+
+**Master Profile:** {profile_json}
+
+**Part to revise ({section_key}):**
+<<<
+{section_markdown}
+>>>
+
+**Output:** Return ONLY the revised Markdown for this part, starting with its heading.
+"""
+
 # --- Nodes ---
 
-def analyze_jd(state: AgentState):
-    print("--- ANALYZING JD ---")
+def normalize_jd(state: AgentState):
+    job_description = state["job_description"]
+    if JD_NORMALIZE_ENABLED:
+        job_description = normalize_job_description(job_description)
+        logger.debug("Normalized JD from %d to %d chars", len(state["job_description"]), len(job_description))
+    updates = {"job_description": job_description}
+    if jd_index is None:
+        return updates
+    match = jd_index.lookup(job_description, state.get("profile_version", ""))
+    if match is None:
+        JD_INDEX_LOOKUPS.inc(result="miss")
+        return updates
+    updates["target_persona"] = match.target_persona
+    reused = ["target_persona"]
+    # The requirement map points into the profile, so it only carries over
+    # when the profile has not changed since.
+    if match.profile_version == state.get("profile_version", ""):
+        updates["requirement_map"] = match.requirement_map
+        reused.append("requirement_map")
+    JD_INDEX_LOOKUPS.inc(result="hit" if len(reused) == 2 else "persona_only")
+    updates["jd_reuse"] = {"id": match.id, "similarity": match.similarity, "reused": reused}
+    logger.debug("Reusing analysis of JD %s (similarity %.2f): %s", match.id, match.similarity, reused)
+    return updates
+
+async def analyze_jd(state: AgentState):
+    logger.debug("Analyzing JD")
     prompt = ChatPromptTemplate.from_template(JD_STRATEGIST_PROMPT)
-    chain = prompt | llm
-    response = chain.invoke({
+    chain = prompt | _llm("analyze_jd")
+    response = await chain.ainvoke({
         "job_description": state["job_description"],
     })
     target_persona = _safe_json_loads(response.content)
-    print(json.dumps(target_persona, indent=2))
+    logger.debug("Target persona: %s", target_persona)
     return {"target_persona": target_persona}
 
-def map_experience(state: AgentState):
-    print("--- MAPPING EXPERIENCE ---")
+def _ranking_query(state: AgentState) -> str:
+    persona = state.get("target_persona", {})
+    terms = [state["job_description"]]
+    if isinstance(persona, dict):
+        terms += persona.get("must_have_skills", []) + persona.get("nice_to_have_skills", [])
+    return " ".join(str(t) for t in terms)
+
+async def map_experience(state: AgentState, config: RunnableConfig):
+    state = _with_profile(state, config)
+    mode = state.get("match_mode") or EXPERIENCE_MATCH_MODE
+    updates = {}
+    if mode == "local" or PROFILE_PRUNE_TOP_K > 0:
+        index = index_for(state["profile"], state.get("profile_version", ""))
+        query = _ranking_query(state)
+        ranked = index.rank(query)
+        if PROFILE_PRUNE_TOP_K > 0:
+            updates["prompt_profile_json"] = compact_json(prune_profile(state["profile"], ranked, PROFILE_PRUNE_TOP_K))
+        if mode == "local":
+            logger.debug("Ranking experience locally")
+            updates["requirement_map"] = build_requirement_map(
+                state["profile"], ranked, index.rank(query, kinds=("skill",))
+            )
+            return updates
+
+    if "requirement_map" in state.get("jd_reuse", {}).get("reused", []):
+        return updates
+
+    logger.debug("Mapping experience")
     prompt = ChatPromptTemplate.from_template(EXPERIENCE_MATCHER_PROMPT)
-    chain = prompt | llm
-    response = chain.invoke({
+    chain = prompt | _llm("map_experience")
+    response = await chain.ainvoke({
         "job_description": state["job_description"],
-        "target_persona_json": json.dumps(state.get("target_persona", {}), indent=2),
-        "profile_json": json.dumps(state["profile"], indent=2),
+        "target_persona_json": compact_json(state.get("target_persona", {})),
+        "profile_json": _profile_json(state),
     })
     requirement_map = _safe_json_loads(response.content)
-    print(json.dumps(requirement_map, indent=2))
-    return {"requirement_map": requirement_map}
+    logger.debug("Requirement map: %s", requirement_map)
+    updates["requirement_map"] = requirement_map
+    persona = state.get("target_persona", {})
+    # Unparseable replies come back as {"raw": ...}; those are not worth reusing.
+    if jd_index is not None and "raw" not in requirement_map and isinstance(persona, dict) and "raw" not in persona:
+        jd_index.add(state["job_description"], state.get("profile_version", ""), persona, requirement_map)
+    return updates
 
-def ghostwrite_resume(state: AgentState):
-    print("--- GHOSTWRITING RESUME ---")
-    prompt = ChatPromptTemplate.from_template(GHOSTWRITER_RESUME_PROMPT)
-    chain = prompt | llm
-    response = chain.invoke({
+def _resume_writer_inputs(state: AgentState, reviewer_instructions: str) -> dict:
+    return {
         "job_description": state["job_description"],
-        "target_persona_json": json.dumps(state.get("target_persona", {}), indent=2),
-        "requirement_map_json": json.dumps(state.get("requirement_map", {}), indent=2),
-        "reviewer_instructions": state.get("reviewer_instructions", ""),
-        "profile_json": json.dumps(state["profile"], indent=2),
-    })
+        "target_persona_json": compact_json(state.get("target_persona", {})),
+        "requirement_map_json": compact_json(state.get("requirement_map", {})),
+        "reviewer_instructions": reviewer_instructions,
+        "profile_json": _prompt_profile_json(state),
+    }
+
+def _candidate_emphases(persona: dict, count: int) -> list[str]:
+    """
+    One writer instruction per candidate. The first candidate gets none, so it
+    is the same draft a single-candidate run would produce; the others lead
+    with the persona's strategic focus, pain points and must-have skills.
+    """
+    persona = persona if isinstance(persona, dict) else {}
+    emphases = [""]
+    if persona.get("strategic_focus"):
+        emphases.append(f"Emphasis for this draft: {persona['strategic_focus']}.")
+    for pain_point in persona.get("core_pain_points") or []:
+        emphases.append(f"Emphasis for this draft: lead with the experience that best shows you can solve \"{pain_point}\".")
+    if persona.get("must_have_skills"):
+        skills = ", ".join(str(s) for s in persona["must_have_skills"])
+        emphases.append(f"Emphasis for this draft: surface the must-have skills ({skills}) in the summary and the first bullets.")
+    emphases.append("Emphasis for this draft: lead every entry with its most quantified, highest-impact bullet.")
+    emphases.append("Emphasis for this draft: favour depth over breadth; give the most relevant role and project the most detail.")
+    # More candidates than distinct emphases differ only by temperature.
+    return [emphases[i % len(emphases)] for i in range(count)]
+
+async def _draft_candidates(state: AgentState, count: int) -> dict:
+    logger.debug("Ghostwriting %d resume candidates", count)
+    prompt = ChatPromptTemplate.from_template(GHOSTWRITER_RESUME_PROMPT)
+    model = _llm("ghostwrite_resume")
+    drafts = []
+    for i, emphasis in enumerate(_candidate_emphases(state.get("target_persona", {}), count)):
+        candidate_model = model
+        if RESUME_CANDIDATE_TEMPERATURES:
+            candidate_model = model.bind(temperature=RESUME_CANDIDATE_TEMPERATURES[i % len(RESUME_CANDIDATE_TEMPERATURES)])
+        # Tagged so streamed tokens can be told apart (see stream_workflow_events).
+        chain = prompt | candidate_model.with_config(metadata={"resume_candidate": i})
+        drafts.append(chain.ainvoke(_resume_writer_inputs(state, emphasis)))
+    responses = await asyncio.gather(*drafts)
+    candidates = [response.content for response in responses]
+    return {"resume_markdown": candidates[0], "resume_candidates": candidates}
+
+async def ghostwrite_resume(state: AgentState, config: RunnableConfig):
+    state = _with_profile(state, config)
+    if RESUME_CANDIDATES > 1 and not state.get("review_rounds"):
+        return await _draft_candidates(state, RESUME_CANDIDATES)
+    logger.debug("Ghostwriting resume")
+    prompt = ChatPromptTemplate.from_template(GHOSTWRITER_RESUME_PROMPT)
+    chain = prompt | _llm("ghostwrite_resume")
+    response = await chain.ainvoke(_resume_writer_inputs(state, state.get("reviewer_instructions", "")))
     return {"resume_markdown": response.content}
 
-def ghostwrite_cover_letter(state: AgentState):
-    print("--- GHOSTWRITING COVER LETTER ---")
+async def ghostwrite_cover_letter(state: AgentState, config: RunnableConfig):
+    state = _with_profile(state, config)
+    logger.debug("Ghostwriting cover letter")
     prompt = ChatPromptTemplate.from_template(GHOSTWRITER_COVER_LETTER_PROMPT)
-    chain = prompt | llm
-    response = chain.invoke({
+    chain = prompt | _llm("ghostwrite_cover_letter")
+    response = await chain.ainvoke({
         "job_description": state["job_description"],
-        "target_persona_json": json.dumps(state.get("target_persona", {}), indent=2),
-        "requirement_map_json": json.dumps(state.get("requirement_map", {}), indent=2),
+        "target_persona_json": compact_json(state.get("target_persona", {})),
+        "requirement_map_json": compact_json(state.get("requirement_map", {})),
         "reviewer_instructions": state.get("reviewer_instructions", ""),
-        "profile_json": json.dumps(state["profile"], indent=2),
+        "profile_json": _prompt_profile_json(state),
     })
     return {"cover_letter_text": response.content}
 
-def review_quality(state: AgentState):
-    print("--- REVIEWING QUALITY ---")
+async def revise_resume(state: AgentState, config: RunnableConfig):
+    state = _with_profile(state, config)
+    critique = state.get("critique")
+    flagged = critique.get("flagged_sections") if isinstance(critique, dict) else None
+    resume = state.get("resume_markdown", "")
+    blocks = split_resume(resume)
+    spans = flagged_spans(blocks, list(flagged or {}))
+    rewrite_chars = sum(len(span_text(blocks, indices)) for indices in spans.values())
+    if not spans or critique.get("full_rewrite") or rewrite_chars > PARTIAL_REVISION_MAX_SHARE * len(resume):
+        return await ghostwrite_resume(state, config)
+
+    logger.debug("Revising sections: %s", list(spans))
+    prompt = ChatPromptTemplate.from_template(SECTION_REWRITER_PROMPT)
+    chain = prompt | _llm("revise_resume")
+    responses = await asyncio.gather(*(
+        chain.ainvoke({
+            "instruction": flagged[key],
+            "requirement_map_json": compact_json(state.get("requirement_map", {})),
+            "profile_json": _prompt_profile_json(state),
+            "section_key": key,
+            "section_markdown": span_text(blocks, indices).strip(),
+        })
+        for key, indices in spans.items()
+    ))
+    rewritten = {
+        key: _strip_code_fences(response.content).removeprefix("<<<").removesuffix(">>>")
+        for key, response in zip(spans, responses)
+    }
+    return {"resume_markdown": splice(blocks, spans, rewritten)}
+
+def _flag_sections(critique: dict, report, blocks) -> tuple[dict, bool]:
+    """
+    Maps the critique's issues to resume sections: validator issues by their
+    section, LLM critic issues by the ids it listed. Returns {section key:
+    instruction} and whether the resume needs a full rewrite instead.
+    """
+    flagged: dict[str, list[str]] = {}
+    full_rewrite = False
+    if report is not None:
+        for issue in report.issues:
+            key = resolve_key(issue.section, blocks)
+            if issue.code in GLOBAL_ISSUE_CODES or key is None:
+                full_rewrite = True
+            else:
+                flagged.setdefault(key, []).append(issue.message)
+    if critique.get("source") != "validator":
+        items = critique.get("flagged_sections") or []
+        if not isinstance(items, list) or not items:
+            full_rewrite = True
+            items = []
+        for item in items:
+            if isinstance(item, dict):
+                name, instruction = str(item.get("section", "")), str(item.get("instruction", ""))
+            else:
+                name, instruction = str(item), ""
+            key = resolve_key(name, blocks)
+            if key is None:
+                full_rewrite = True
+            else:
+                flagged.setdefault(key, []).append(instruction or critique.get("revision_instructions", ""))
+    return {key: " ".join(messages) for key, messages in flagged.items()}, full_rewrite
+
+async def _render_for_page_count(resume_markdown: str, profile: dict) -> Optional[bytes]:
+    # Rendered on the PDF worker pool like exports, so the CPU-bound layout
+    # does not hold the API process's GIL while other runs are in flight.
+    try:
+        return await shared_pool().render_resume(resume_markdown, profile, document="resume_check")
+    except (PDFPoolBusy, PDFRenderTimeout) as e:
+        logger.warning("Skipping the page-count check: %s", e)
+        return None
+
+async def _validate(state: AgentState, resume_markdown: str):
+    """
+    Runs the local pre-critic. Returns the validator's critique when its score
+    is decisive (no LLM review needed), the report, and the findings to hand to
+    the LLM critic otherwise.
+    """
+    if not PRECRITIC_ENABLED:
+        return None, None, "None."
+    pdf_bytes = await _render_for_page_count(resume_markdown, state["profile"])
+    report = validate_resume(resume_markdown, state["profile"], pdf_bytes)
+    # Without a render the page limit is unchecked, so a clean score is not a
+    # pass; the LLM critic reviews the draft instead.
+    passed = report.score >= PRECRITIC_PASS_SCORE and pdf_bytes is not None
+    if passed or report.score <= PRECRITIC_FAIL_SCORE:
+        logger.debug("Local review: score %d", report.score)
+        return {
+            "match_score": report.score,
+            "issues_found": [issue.message for issue in report.issues],
+            "revision_instructions": revision_instructions(report),
+            "source": "validator",
+        }, report, "None."
+    findings = [f"- {issue.message}" for issue in report.issues]
+    if pdf_bytes is None:
+        findings.append("- Page count unverified: the PDF could not be rendered; check the resume fits on one page.")
+    return None, report, "\n".join(findings) or "None."
+
+def _section_list(blocks) -> str:
+    return "\n".join(f"- {key}" for key in section_keys(blocks))
+
+async def _llm_critique(state: AgentState, resume_markdown: str, validator_findings: str, blocks) -> dict:
     prompt = ChatPromptTemplate.from_template(QUALITY_CRITIC_PROMPT)
-    chain = prompt | llm
-    response = chain.invoke({
+    chain = prompt | _llm("review_quality")
+    response = await chain.ainvoke({
         "job_description": state["job_description"],
-        "target_persona_json": json.dumps(state.get("target_persona", {}), indent=2),
-        "requirement_map_json": json.dumps(state.get("requirement_map", {}), indent=2),
-        "profile_json": json.dumps(state["profile"], indent=2),
-        "resume_markdown": state.get("resume_markdown", ""),
+        "target_persona_json": compact_json(state.get("target_persona", {})),
+        "requirement_map_json": compact_json(state.get("requirement_map", {})),
+        "profile_json": _prompt_profile_json(state),
+        "resume_markdown": resume_markdown,
         "cover_letter_text": state.get("cover_letter_text", ""),
+        "validator_findings": validator_findings,
+        "section_keys": _section_list(blocks),
     })
     critique = _safe_json_loads(response.content)
-    print(json.dumps(critique, indent=2))
+    logger.debug("Critique: %s", critique)
+    return critique
+
+async def _critique_candidates(state: AgentState, candidates: list[str], blocks: list) -> list[tuple]:
+    """
+    (critique, report) for every candidate. Candidates the validator cannot
+    settle on its own are graded together in one LLM call, so the shared
+    persona and profile are sent once rather than once per candidate.
+    """
+    validations = await asyncio.gather(*(_validate(state, candidate) for candidate in candidates))
+    undecided = [i for i, (critique, _, _) in enumerate(validations) if critique is None]
+    reviews = {}
+    if len(undecided) == 1:
+        i = undecided[0]
+        reviews[i] = await _llm_critique(state, candidates[i], validations[i][2], blocks[i])
+    elif undecided:
+        rendered = "\n\n".join(
+            f"<<<CANDIDATE {n}>>>\n**Resume Sections:**\n{_section_list(blocks[i])}\n"
+            f"**Automated Checks:**\n{validations[i][2]}\n\n{candidates[i]}\n<<<END CANDIDATE {n}>>>"
+            for n, i in enumerate(undecided, start=1)
+        )
+        prompt = ChatPromptTemplate.from_template(QUALITY_CRITIC_BATCH_PROMPT)
+        chain = prompt | _llm("review_quality")
+        response = await chain.ainvoke({
+            "candidate_count": len(undecided),
+            "target_persona_json": compact_json(state.get("target_persona", {})),
+            "profile_json": _prompt_profile_json(state),
+            "candidates": rendered,
+        })
+        parsed = _safe_json_loads(response.content).get("reviews")
+        logger.debug("Batched critique: %s", parsed)
+        for review in parsed if isinstance(parsed, list) else []:
+            try:
+                n = int(review.get("candidate"))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if 1 <= n <= len(undecided):
+                reviews[undecided[n - 1]] = review
+        for i in undecided:
+            # A candidate the critic skipped is never preferred over a graded one.
+            reviews.setdefault(i, {"match_score": 0, "issues_found": ["Not graded by the critic."]})
+    return [
+        (critique if critique is not None else reviews[i], report)
+        for i, (critique, report, _) in enumerate(validations)
+    ]
+
+def _score(critique) -> int:
+    try:
+        return int(critique.get("match_score", 0)) if isinstance(critique, dict) else 0
+    except (TypeError, ValueError):
+        return 0
+
+async def review_quality(state: AgentState, config: RunnableConfig):
+    state = _with_profile(state, config)
+    logger.debug("Reviewing quality")
+    updates = {}
+    candidates = state.get("resume_candidates") or []
+    if len(candidates) > 1 and not state.get("review_rounds"):
+        blocks_per_candidate = [split_resume(candidate) for candidate in candidates]
+        reviews = await _critique_candidates(state, candidates, blocks_per_candidate)
+        scores = [_score(critique) for critique, _ in reviews]
+        best = scores.index(max(scores))
+        logger.debug("Candidate scores %s, keeping candidate %d", scores, best)
+        resume_markdown, blocks = candidates[best], blocks_per_candidate[best]
+        critique, report = reviews[best]
+        if isinstance(critique, dict):
+            critique["candidate"] = best
+            critique["candidate_scores"] = scores
+        updates.update({"resume_markdown": resume_markdown, "resume_candidates": []})
+    else:
+        resume_markdown = state.get("resume_markdown", "")
+        blocks = split_resume(resume_markdown)
+        critique, report, validator_findings = await _validate(state, resume_markdown)
+        if critique is None:
+            critique = await _llm_critique(state, resume_markdown, validator_findings, blocks)
+    if isinstance(critique, dict):
+        critique["flagged_sections"], critique["full_rewrite"] = _flag_sections(critique, report, blocks)
     match_score = critique.get("match_score", 0) if isinstance(critique, dict) else 0
     review_rounds = state.get("review_rounds", 0) + 1
-    updates = {
+    updates.update({
         "critique": critique,
         "match_score": match_score,
         "reviewer_instructions": critique.get("revision_instructions", "") if isinstance(critique, dict) else "",
         "review_rounds": review_rounds,
-    }
+    })
     if review_rounds == 1:
         updates.update({
-            "best_resume_markdown": state.get("resume_markdown", ""),
-            "best_cover_letter_text": state.get("cover_letter_text", ""),
+            "best_resume_markdown": resume_markdown,
             "best_match_score": match_score,
         })
     else:
@@ -266,26 +703,52 @@ def review_quality(state: AgentState):
         if match_score < best_score:
             updates.update({
                 "resume_markdown": state.get("best_resume_markdown", state.get("resume_markdown", "")),
-                "cover_letter_text": state.get("best_cover_letter_text", state.get("cover_letter_text", "")),
                 "match_score": best_score,
             })
+        else:
+            # Track the best draft over any number of rounds; finished runs can
+            # be given extra review rounds (see backend/runs.py).
+            updates.update({
+                "best_resume_markdown": resume_markdown,
+                "best_match_score": match_score,
+            })
     return updates
 
 # --- Graph Construction ---
 
 workflow = StateGraph(AgentState)
 
+workflow.add_node("normalize_jd", normalize_jd)
 workflow.add_node("analyze_jd", analyze_jd)
 workflow.add_node("map_experience", map_experience)
 workflow.add_node("ghostwrite_resume", ghostwrite_resume)
 workflow.add_node("ghostwrite_cover_letter", ghostwrite_cover_letter)
 workflow.add_node("review_quality", review_quality)
+# The critic only grades the resume, so revision rounds rework just the resume
+# (only its flagged sections where possible) and keep the first cover letter.
+workflow.add_node("revise_resume", revise_resume)
+
+workflow.set_entry_point("normalize_jd")
+
+def _route_jd(state: AgentState):
+    return "reuse" if state.get("jd_reuse") else "analyze"
 
-workflow.set_entry_point("analyze_jd")
+# A near-duplicate JD brings its persona along, so analyze_jd is skipped.
+workflow.add_conditional_edges(
+    "normalize_jd",
+    _route_jd,
+    {
+        "analyze": "analyze_jd",
+        "reuse": "map_experience",
+    },
+)
 workflow.add_edge("analyze_jd", "map_experience")
+# Fan out: both drafts only depend on the persona and requirement map.
 workflow.add_edge("map_experience", "ghostwrite_resume")
-workflow.add_edge("ghostwrite_resume", "ghostwrite_cover_letter")
-workflow.add_edge("ghostwrite_cover_letter", "review_quality")
+workflow.add_edge("map_experience", "ghostwrite_cover_letter")
+# Fan in: the first review waits for both drafts.
+workflow.add_edge(["ghostwrite_resume", "ghostwrite_cover_letter"], "review_quality")
+workflow.add_edge("revise_resume", "review_quality")
 
 def _route_quality(state: AgentState):
     if state.get("match_score", 0) < 90 and state.get("review_rounds", 0) < 2:
@@ -296,9 +759,90 @@ workflow.add_conditional_edges(
     "review_quality",
     _route_quality,
     {
-        "revise": "ghostwrite_resume",
+        "revise": "revise_resume",
         "done": END,
     },
 )
 
 agent_workflow = workflow.compile()
+
+def compile_checkpointed(checkpointer):
+    """The same graph, saving a checkpoint after every step under the run's thread_id."""
+    return workflow.compile(checkpointer=checkpointer)
+
+# --- Streaming ---
+
+GRAPH_NODES = {
+    "normalize_jd",
+    "analyze_jd",
+    "map_experience",
+    "ghostwrite_resume",
+    "ghostwrite_cover_letter",
+    "review_quality",
+    "revise_resume",
+}
+
+# Which draft each writer node's tokens belong to.
+DRAFT_NODES = {
+    "ghostwrite_resume": "resume",
+    "revise_resume": "resume",
+    "ghostwrite_cover_letter": "coverLetter",
+}
+
+async def stream_workflow_events(initial_state: Optional[AgentState], config: Optional[dict] = None, graph=None):
+    """
+    Runs agent_workflow and yields (event, data) pairs describing its progress:
+    node_start / node_end for each graph node, token for every chunk of the
+    resume and cover letter drafts (tagged with `candidate` when several
+    resume drafts are written at once), critique after each review round,
+    draft with the whole resume after a revision (which may only have streamed
+    the rewritten sections) or after the first review picked the best
+    candidate, and a final done event carrying the finished drafts. Pass a
+    checkpointed `graph` and a thread_id in `config` to record the run
+    (initial_state=None resumes it).
+    """
+    graph = graph or agent_workflow
+    async for event in graph.astream_events(initial_state, config, version="v2"):
+        kind = event["event"]
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chat_model_stream" and node in DRAFT_NODES:
+            text = event["data"]["chunk"].text
+            if text:
+                data = {"node": node, "document": DRAFT_NODES[node], "text": text}
+                candidate = event["metadata"].get("resume_candidate")
+                if candidate is not None:
+                    data["candidate"] = candidate
+                yield "token", data
+
+        elif kind in ("on_chain_start", "on_chain_end") and event["name"] in GRAPH_NODES and event["name"] == node:
+            if kind == "on_chain_start":
+                yield "node_start", {"node": node}
+                continue
+            yield "node_end", {"node": node}
+            output = event["data"].get("output") or {}
+            if node == "review_quality" and isinstance(output, dict):
+                critique = output.get("critique", {})
+                yield "critique", {
+                    "review_round": output.get("review_rounds"),
+                    "match_score": output.get("match_score"),
+                    "issues_found": critique.get("issues_found", []) if isinstance(critique, dict) else [],
+                    "flagged_sections": list(critique.get("flagged_sections", {})) if isinstance(critique, dict) else [],
+                }
+                if isinstance(critique, dict) and "candidate_scores" in critique:
+                    yield "draft", {
+                        "document": "resume",
+                        "text": output.get("resume_markdown", ""),
+                        "candidate": critique["candidate"],
+                        "candidate_scores": critique["candidate_scores"],
+                    }
+            elif node == "revise_resume" and isinstance(output, dict):
+                yield "draft", {"document": "resume", "text": output.get("resume_markdown", "")}
+
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            result = event["data"].get("output") or {}
+            yield "done", {
+                "resume": result.get("resume_markdown", ""),
+                "coverLetter": result.get("cover_letter_text", ""),
+                "match_score": result.get("match_score"),
+            }
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+NUM_PERM = 64
+# 16 bands of 4 rows: signatures agreeing on any band become candidates,
+# which catches pairs above ~0.5 Jaccard with high probability. Candidates
+# are then compared on the full signature against the reuse threshold.
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+
+def _permutations(count: int) -> list[tuple[int, int]]:
+    # Fixed, seeded coefficients so signatures stay comparable across restarts.
+    perms = []
+    for i in range(count):
+        digest = hashlib.sha256(f"jd-minhash-{i}".encode()).digest()
+        a, b = struct.unpack("<QQ", digest[:16])
+        perms.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+    return perms
+
+
+_PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + size]).encode(), digest_size=4).digest(), "little")
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash(text: str) -> list[int]:
+    hashed = shingles(text)
+    return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed) for a, b in _PERMUTATIONS]
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity of the two documents' shingle sets."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def _band_keys(signature: list[int]) -> list[str]:
+    return [
+        hashlib.blake2b(struct.pack(f"<{ROWS}I", *signature[i * ROWS:(i + 1) * ROWS]), digest_size=8).hexdigest()
+        for i in range(BANDS)
+    ]
+
+
+@dataclass
+class JDMatch:
+    id: int
+    similarity: float
+    profile_version: str
+    target_persona: dict
+    requirement_map: dict
+
+
+class JDIndex:
+    """
+    SQLite-backed MinHash index of job descriptions the agents have already
+    analysed, with the JD Strategist's persona and the requirement map they
+    produced. Reposted or near-identical listings are found through LSH bands
+    and can reuse that analysis instead of paying for it again.
+
+    The persona depends only on the JD; the requirement map also depends on
+    the profile, so it is only reused for the same profile version.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.9, max_entries: int = 5000):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jds (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    signature BLOB NOT NULL,
+                    profile_version TEXT NOT NULL,
+                    target_persona TEXT NOT NULL,
+                    requirement_map TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS jd_bands (
+                    band INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    jd_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jd_bands_key ON jd_bands (band, key);
+                CREATE INDEX IF NOT EXISTS jd_bands_jd ON jd_bands (jd_id);
+                """
+            )
+            self._conn.commit()
+
+    def lookup(self, job_description: str, profile_version: str) -> Optional[JDMatch]:
+        """
+        The most similar stored JD at or above the threshold, preferring
+        entries made with `profile_version`; None if there is none.
+        """
+        signature = minhash(job_description)
+        bands = _band_keys(signature)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT jds.* FROM jd_bands JOIN jds ON jds.id = jd_bands.jd_id WHERE "
+                + " OR ".join("(jd_bands.band = ? AND jd_bands.key = ?)" for _ in bands),
+                [value for i, key in enumerate(bands) for value in (i, key)],
+            ).fetchall()
+        best = None
+        for row_id, blob, version, persona, requirement_map, _ in rows:
+            score = similarity(signature, list(struct.unpack(f"<{NUM_PERM}I", blob)))
+            if score < self.threshold:
+                continue
+            rank = (version == profile_version, score)
+            if best is None or rank > best[0]:
+                best = (rank, JDMatch(row_id, round(score, 3), version, json.loads(persona), json.loads(requirement_map)))
+        if best is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return best[1]
+
+    def add(self, job_description: str, profile_version: str, target_persona: dict, requirement_map: dict):
+        signature = minhash(job_description)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jds (signature, profile_version, target_persona, requirement_map, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (struct.pack(f"<{NUM_PERM}I", *signature), profile_version,
+                 json.dumps(target_persona), json.dumps(requirement_map), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO jd_bands (band, key, jd_id) VALUES (?, ?, ?)",
+                [(i, key, cursor.lastrowid) for i, key in enumerate(_band_keys(signature))],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM jds").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            oldest = "SELECT id FROM jds ORDER BY id ASC LIMIT ?"
+            self._conn.execute(f"DELETE FROM jd_bands WHERE jd_id IN ({oldest})", (overflow,))
+            self._conn.execute(f"DELETE FROM jds WHERE id IN ({oldest})", (overflow,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM jds").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+        }
+
+
+def jd_index_from_env() -> Optional[JDIndex]:
+    """Builds the JD index from JD_INDEX_* environment variables, or None if disabled."""
+    if os.getenv("JD_INDEX_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return JDIndex(
+        path=os.getenv("JD_INDEX_PATH", ".cache/jd_index.sqlite"),
+        threshold=float(os.getenv("JD_REUSE_THRESHOLD", "0.9")),
+        max_entries=int(os.getenv("JD_INDEX_MAX_ENTRIES", "5000")),
+    )
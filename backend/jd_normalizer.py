@@ -0,0 +1,168 @@
+import re
+
+# Section headings whose content never helps tailor a resume: legal notices,
+# benefits, application logistics. Everything under one is dropped until the
+# next heading.
+_BOILERPLATE_HEADINGS = re.compile(
+    r"^(?:"
+    r"equal (?:employment )?opportunit(?:y|ies)(?: employer| statement)?|eeo(?: statement)?|diversity.*inclusion.*|"
+    r"(?:our )?commitment to diversity.*|"
+    r"(?:our )?benefits(?: and perks| & perks)?|perks(?: and benefits| & benefits)?|what we offer|"
+    r"why (?:you'll love )?work(?:ing)? (?:with|at|for) us|what's in it for you|"
+    r"(?:compensation|salary|pay)(?: and benefits| & benefits| range| transparency)?|"
+    r"(?:applicant )?privacy(?: notice| policy| statement)?|"
+    r"(?:reasonable )?accommodations?(?: request)?|"
+    r"how to apply|application process|e-?verify|disclaimer|legal notice"
+    r")$"
+)
+
+# About-the-company sections keep their first paragraph (what the company
+# does, which the JD Strategist reads for culture signals) and drop the rest
+# of the company blurb, up to the next heading or the first line about the role.
+_ABOUT_HEADINGS = re.compile(
+    r"^(?:about (?:us|the company|the team|[a-z0-9&.' -]{1,30})|who we are|our (?:mission|story|values|culture))$"
+)
+
+# Headings that start real job content. Any other heading-shaped line also
+# ends a skipped section; these additionally protect their lines from the
+# boilerplate sentence filter below.
+_CONTENT_HEADINGS = re.compile(
+    r"^(?:about (?:the|this) (?:role|position|job|opportunity)|the role|the opportunity|overview|summary|"
+    r"(?:key )?responsibilities|what you(?:'ll| will) do|your (?:role|impact|mission)|in this role.*|"
+    r"(?:basic |minimum |preferred |required )?qualifications|requirements|what you(?:'ll| will)? bring|"
+    r"about you|who you are|you (?:have|are|might be)|(?:nice|good) to have|bonus points|tech(?:nology)? stack|"
+    r"(?:required |preferred )?skills|experience)$"
+)
+
+# Boilerplate sentences that appear without a heading of their own; scraped
+# text keeps each paragraph on one line, so matching lines are dropped. Only
+# applied outside content sections: a responsibility such as "build tooling
+# that enforces our privacy policy" is real job content.
+_BOILERPLATE_PARAGRAPH = re.compile(
+    r"equal (?:employment )?opportunity employer|regardless of (?:race|age|sex|gender)|without regard to (?:race|age|sex)|"
+    r"reasonable accommodation|e-verify|pay transparency|privacy (?:notice|policy)|"
+    r"unsolicited (?:resumes|applications)|recruitment agencies|"
+    r"protected (?:veteran|characteristic)|affirmative action",
+    re.IGNORECASE,
+)
+
+# Lines in an About section that are about the job rather than the company.
+_ROLE_PROSE = re.compile(
+    r"\bwe(?:'re| are)(?: actively)? (?:hiring|looking|seeking)|\byou(?:'ll|'re| will| would)?\b|\byour\b|"
+    r"\b(?:this|the) (?:role|position|team you)\b|\bjoin (?:us|our)\b",
+    re.IGNORECASE,
+)
+
+_BULLET_RE = re.compile(r"^(?:[•●▪◦‣⁃∙·]|\*(?=\s))\s*")
+_SPACE_RE = re.compile(r"[ \t  ​]+")
+
+
+def _heading_text(line: str) -> str:
+    """The line reduced to a comparable heading, or "" if it is too long to be one."""
+    text = line.strip().strip("#*_:").strip().rstrip(":").strip("*_ ").lower()
+    text = text.replace("’", "'")
+    if not text or len(text) > 60 or len(text.split()) > 8:
+        return ""
+    return text
+
+
+def _is_marked_heading(line: str) -> bool:
+    stripped = line.strip()
+    return (
+        stripped.startswith("#")
+        or stripped.endswith(":")
+        or (stripped.startswith("**") and stripped.endswith("**"))
+    )
+
+
+def _is_heading_shaped(line: str) -> bool:
+    """Short, not a bullet and not a sentence: "Must have", "What we're looking for", "**Bonus**"."""
+    if not _heading_text(line) or line.startswith("- "):
+        return False
+    return not line.rstrip("*_ ").endswith((".", "!", "?", ",", ";"))
+
+
+def _label_heading(line: str) -> str:
+    """The label of a "Label: value" line such as "Nice to have: Spark", or ""."""
+    label, sep, value = line.partition(":")
+    if not sep or not value.strip():
+        return ""
+    return _heading_text(label)
+
+
+def _clean_line(line: str) -> str:
+    line = _SPACE_RE.sub(" ", line).strip()
+    return _BULLET_RE.sub("- ", line)
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    Strips boilerplate from a scraped job description before it is put in the
+    agents' prompts: EEO and legal notices, benefits and perks, application
+    instructions, and all but the first paragraph of "About us". Whitespace is
+    collapsed, bullets are unified to "- " and runs of blank lines become one.
+
+    Falls back to the whitespace-collapsed text if stripping would leave
+    almost nothing, e.g. for a JD that is a single paragraph of legal text.
+    """
+    lines = [_clean_line(line) for line in text.splitlines()]
+    kept: list[str] = []
+    # "keep", "skip" (boilerplate section) or "about" (keep first paragraph)
+    mode = "keep"
+    about_paragraph_seen = False
+    # Inside a content section (Responsibilities, Requirements, ...) nothing is
+    # filtered. The section ends at the next heading, or at a prose paragraph
+    # after its bullet list, which is where unheaded EEO statements sit.
+    in_content = False
+    list_seen = False
+    after_blank = False
+    for line in lines:
+        heading = _heading_text(line)
+        if heading and _BOILERPLATE_HEADINGS.match(heading):
+            mode = "skip"
+            in_content = False
+            continue
+        if heading and _ABOUT_HEADINGS.match(heading) and not _CONTENT_HEADINGS.match(heading):
+            mode = "about"
+            about_paragraph_seen = False
+            in_content = False
+            kept.append(line)
+            continue
+        label = _label_heading(line)
+        if (heading and _CONTENT_HEADINGS.match(heading)) or (label and _CONTENT_HEADINGS.match(label)):
+            mode = "keep"
+            in_content, list_seen, after_blank = True, False, False
+            kept.append(line)
+            continue
+        if _is_heading_shaped(line) and (mode == "skip" or (mode == "about" and about_paragraph_seen)):
+            # Any other heading ends a boilerplate or About section, so
+            # "Must have" or "The Team" after "Perks & Benefits" is kept.
+            mode = "keep"
+        if heading and _is_marked_heading(line):
+            in_content = False
+        if mode == "skip":
+            continue
+        if mode == "about":
+            if not line:
+                kept.append(line)
+                continue
+            if about_paragraph_seen and not kept[-1]:
+                if not _ROLE_PROSE.search(line):
+                    continue
+                # "We're hiring a ... to own ..." describes the job; keep it and what follows.
+                mode = "keep"
+            about_paragraph_seen = True
+        if in_content and line:
+            if line.startswith("- "):
+                list_seen = True
+            elif list_seen and after_blank:
+                in_content = False
+        after_blank = not line
+        if in_content or not _BOILERPLATE_PARAGRAPH.search(line):
+            kept.append(line)
+
+    normalized = re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+    collapsed = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    if len(normalized) < 0.2 * len(collapsed):
+        return collapsed
+    return normalized
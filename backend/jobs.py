@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class JobStore:
+    """SQLite-backed store of batch generation jobs, their results and exported PDFs."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    batch_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    job_description TEXT NOT NULL,
+                    company_name TEXT,
+                    export_pdf INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id, position);
+                CREATE TABLE IF NOT EXISTS job_pdfs (
+                    job_id TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (job_id, type)
+                );
+                """
+            )
+            self._conn.commit()
+
+    def create_batch(self, items: list[dict], export_pdf: bool) -> tuple[str, list[str]]:
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+        job_ids = [uuid.uuid4().hex for _ in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO jobs (id, batch_id, position, status, job_description, company_name, export_pdf, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, batch_id, i, QUEUED, item["job_description"], item.get("company_name"),
+                     int(export_pdf), now, now)
+                    for i, (job_id, item) in enumerate(zip(job_ids, items))
+                ],
+            )
+            self._conn.commit()
+        return batch_id, job_ids
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            pdfs = [r["type"] for r in self._conn.execute("SELECT type FROM job_pdfs WHERE job_id = ?", (job_id,))]
+        return self._to_dict(row, pdfs) if row else None
+
+    def job_description(self, job_id: str) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT job_description FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["job_description"]
+
+    def list_batch(self, batch_id: str) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE batch_id = ? ORDER BY position", (batch_id,)
+            ).fetchall()
+            pdfs = {}
+            for r in self._conn.execute(
+                "SELECT job_id, type FROM job_pdfs WHERE job_id IN (SELECT id FROM jobs WHERE batch_id = ?)",
+                (batch_id,),
+            ):
+                pdfs.setdefault(r["job_id"], []).append(r["type"])
+        return [self._to_dict(row, pdfs.get(row["id"], [])) for row in rows]
+
+    def set_status(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = COALESCE(?, result), error = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def save_pdf(self, job_id: str, pdf_type: str, data: bytes):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_pdfs (job_id, type, data) VALUES (?, ?, ?)", (job_id, pdf_type, data)
+            )
+            self._conn.commit()
+
+    def get_pdf(self, job_id: str, pdf_type: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM job_pdfs WHERE job_id = ? AND type = ?", (job_id, pdf_type)
+            ).fetchone()
+        return row["data"] if row else None
+
+    def requeue_unfinished(self) -> list[str]:
+        """Marks jobs left queued or running by a previous process as queued again, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at, position", (QUEUED, RUNNING)
+            ).fetchall()
+            self._conn.execute("UPDATE jobs SET status = ? WHERE status = ?", (QUEUED, RUNNING))
+            self._conn.commit()
+        return [row["id"] for row in rows]
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, pdfs: list[str]) -> dict:
+        return {
+            "id": row["id"],
+            "batch_id": row["batch_id"],
+            "status": row["status"],
+            "company_name": row["company_name"],
+            "export_pdf": bool(row["export_pdf"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "pdfs": sorted(pdfs),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+
+class JobQueue:
+    """
+    Runs stored jobs on a fixed number of asyncio workers. Job state lives in
+    the JobStore, so jobs interrupted by a restart are picked up again by start().
+
+    `generate(job_id, job_description)` produces the drafts dict; `export(job, result)`
+    returns {pdf_type: bytes} for jobs that asked for PDFs.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        generate: Callable[[str, str], Awaitable[dict]],
+        export: Callable[[dict, dict], Awaitable[dict]],
+        concurrency: int,
+    ):
+        self.store = store
+        self.generate = generate
+        self.export = export
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+
+    async def start(self):
+        for job_id in await asyncio.to_thread(self.store.requeue_unfinished):
+            self._queue.put_nowait(job_id)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, job_ids: list[str]):
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] != QUEUED:
+            return
+        await asyncio.to_thread(self.store.set_status, job_id, RUNNING)
+        try:
+            job_description = await asyncio.to_thread(self.store.job_description, job_id)
+            result = await self.generate(job_id, job_description)
+            if job["export_pdf"]:
+                for pdf_type, data in (await self.export(job, result)).items():
+                    await asyncio.to_thread(self.store.save_pdf, job_id, pdf_type, data)
+            await asyncio.to_thread(self.store.set_status, job_id, SUCCEEDED, result)
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for requeue_unfinished on next start.
+            raise
+        except Exception as e:
+            print(f"Batch job {job_id} failed: {e}")
+            await asyncio.to_thread(self.store.set_status, job_id, FAILED, None, str(e))
@@ -0,0 +1,350 @@
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Optional
+
+import httpx
+from langchain_core.caches import BaseCache
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import PrivateAttr
+
+from backend.metrics import LLM_RATE_LIMIT_WAIT_SECONDS, LLM_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# Graph nodes that only classify or grade run on the fast tier; the writers
+# that produce the drafts run on the strong tier. LLM_MODEL_<NODE> overrides
+# the model for a single node (e.g. LLM_MODEL_REVIEW_QUALITY=gemini-2.5-pro).
+NODE_MODEL_TIERS = {
+    "analyze_jd": "fast",
+    "map_experience": "strong",
+    "ghostwrite_resume": "strong",
+    "ghostwrite_cover_letter": "strong",
+    "revise_resume": "strong",
+    "review_quality": "fast",
+}
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_RETRYABLE_TEXT = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL")
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+class LLMRateLimited(Exception):
+    """Raised when a model keeps answering 429 after every retry."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `per_minute`, holding at most
+    `capacity` (one minute's worth by default). Waiters are served in order.
+
+    `charge()` adjusts the level after the fact, so an estimate taken before a
+    call can be reconciled with the real usage; the level may go negative, which
+    simply delays the next acquire.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Waits until `amount` is available and takes it; returns seconds waited."""
+        # A single request larger than the bucket would otherwise never fit.
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                delay = max(self._blocked_until - time.monotonic(), 0.0)
+                if not delay and self.level >= amount:
+                    self.level -= amount
+                    return waited
+                if not delay:
+                    delay = (amount - self.level) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def charge(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def block(self, seconds: float):
+        """Holds every waiter back for `seconds`, e.g. after the API answered 429."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class ModelLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one model, plus counters."""
+
+    def __init__(self, model: str, rpm: float, tpm: float):
+        self.model = model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    async def acquire(self, estimated_tokens: int):
+        waited = await self.requests.acquire(1)
+        waited += await self.tokens.acquire(estimated_tokens)
+        self.wait_seconds += waited
+        self.calls += 1
+        LLM_RATE_LIMIT_WAIT_SECONDS.observe(waited, model=self.model)
+
+    def record_usage(self, estimated_tokens: int, usage: Optional[dict]):
+        if not usage:
+            return
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.tokens.charge(usage.get("input_tokens", estimated_tokens) - estimated_tokens)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "request_tokens_available": round(self.requests.level, 1),
+            "token_budget_available": round(self.tokens.level),
+        }
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code
+    cause = exc.__cause__
+    return _status_code(cause) if cause is not None else None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    return _status_code(exc) == 429 or "RESOURCE_EXHAUSTED" in str(exc)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    if getattr(exc, "is_retryable", False) or _status_code(exc) in _RETRYABLE_STATUS:
+        return True
+    text = str(exc)
+    return any(marker in text for marker in _RETRYABLE_TEXT)
+
+
+def _server_retry_delay(exc: BaseException) -> Optional[float]:
+    match = _RETRY_DELAY_RE.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+def estimate_tokens(messages) -> int:
+    # ~4 characters per token is close enough for budgeting; the bucket is
+    # corrected with the real usage once the response arrives.
+    chars = sum(len(m.content) if isinstance(m.content, str) else len(str(m.content)) for m in messages)
+    return max(chars // 4, 1)
+
+
+class GatewayChatModel(ChatGoogleGenerativeAI):
+    """
+    ChatGoogleGenerativeAI that takes its requests and tokens from a shared
+    ModelLimiter and retries transient errors with jittered exponential backoff.
+
+    Only network calls pass through here; responses served from the LLM cache
+    never reach _agenerate/_astream, so they neither wait nor use quota.
+    """
+
+    _limiter: ModelLimiter = PrivateAttr()
+    _max_attempts: int = PrivateAttr(default=5)
+    _base_delay: float = PrivateAttr(default=1.0)
+    _max_delay: float = PrivateAttr(default=30.0)
+
+    def __init__(
+        self, *, limiter: ModelLimiter, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 30.0, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self._limiter = limiter
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        delay = random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt))
+        if is_rate_limit_error(exc):
+            self._limiter.rate_limited += 1
+            hint = _server_retry_delay(exc)
+            if hint is not None:
+                delay = max(delay, hint)
+            # Everyone sharing this model's quota backs off, not just this call.
+            self._limiter.requests.block(delay)
+        return delay
+
+    def _count_retry(self, run_manager):
+        self._limiter.retries += 1
+        node = run_manager.metadata.get("langgraph_node", "") if run_manager else ""
+        LLM_RETRIES.inc(node=node, model=self.model)
+
+    @staticmethod
+    def _record_retries(message, attempt: int):
+        # Read back by RunMetrics, so a run's timing breakdown shows which calls were retried.
+        if attempt:
+            message.response_metadata["retries"] = attempt
+
+    def _give_up(self, exc: BaseException, delay: float):
+        self._limiter.failures += 1
+        if is_rate_limit_error(exc):
+            raise LLMRateLimited(f"Rate limit for '{self.model}' still exceeded after retries: {exc}", delay) from exc
+        raise exc
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = estimate_tokens(messages)
+        for attempt in range(self._max_attempts):
+            await self._limiter.acquire(estimated)
+            try:
+                result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                if not is_transient_error(e):
+                    self._limiter.failures += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                if attempt + 1 == self._max_attempts:
+                    self._give_up(e, delay)
+                self._count_retry(run_manager)
+                logger.warning("LLM call to %s failed (%s); retrying in %.1fs", self.model, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            usage = result.generations[0].message.usage_metadata if result.generations else None
+            self._limiter.record_usage(estimated, usage)
+            if result.generations:
+                self._record_retries(result.generations[0].message, attempt)
+            return result
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        estimated = estimate_tokens(messages)
+        for attempt in range(self._max_attempts):
+            await self._limiter.acquire(estimated)
+            started = False
+            usage = None
+            try:
+                async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    if not started:
+                        self._record_retries(chunk.message, attempt)
+                    started = True
+                    if chunk.message.usage_metadata:
+                        usage = chunk.message.usage_metadata
+                    yield chunk
+            except Exception as e:
+                # Tokens already sent to the client cannot be taken back, so
+                # only a stream that failed before its first chunk is retried.
+                if started or not is_transient_error(e):
+                    self._limiter.failures += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                if attempt + 1 == self._max_attempts:
+                    self._give_up(e, delay)
+                self._count_retry(run_manager)
+                logger.warning("LLM stream from %s failed (%s); retrying in %.1fs", self.model, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            self._limiter.record_usage(estimated, usage)
+            return
+
+
+class LLMGateway:
+    """
+    Hands out one GatewayChatModel per model name. Every node using the same
+    model shares that model's RPM/TPM buckets, so concurrent agent runs queue
+    for quota instead of failing with 429s.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[BaseCache] = None,
+        fast_model: str = "gemini-2.5-flash-lite",
+        strong_model: str = "gemini-2.5-flash",
+        rpm: float = 1000,
+        tpm: float = 1_000_000,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        self.cache = cache
+        self.tiers = {"fast": fast_model, "strong": strong_model}
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._models: dict[str, GatewayChatModel] = {}
+        self._limiters: dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def model_for(self, node: str) -> str:
+        override = os.getenv(f"LLM_MODEL_{node.upper()}")
+        return override or self.tiers[NODE_MODEL_TIERS.get(node, "strong")]
+
+    def for_node(self, node: str) -> GatewayChatModel:
+        model = self.model_for(node)
+        with self._lock:
+            llm = self._models.get(model)
+            if llm is None:
+                # max_retries=1 turns off the SDK's own retries; the gateway
+                # retries instead so waits are coordinated with the buckets.
+                self._limiters[model] = ModelLimiter(model, self.rpm, self.tpm)
+                llm = GatewayChatModel(
+                    model=model,
+                    cache=self.cache,
+                    max_retries=1,
+                    limiter=self._limiters[model],
+                    max_attempts=self.max_attempts,
+                    base_delay=self.base_delay,
+                    max_delay=self.max_delay,
+                )
+                self._models[model] = llm
+        return llm
+
+    def warm_up(self):
+        """Builds every tier's client ahead of the first call."""
+        for node in NODE_MODEL_TIERS:
+            self.for_node(node)
+
+    def stats(self) -> dict:
+        return {
+            "tiers": {node: self.model_for(node) for node in NODE_MODEL_TIERS},
+            "limits": {"rpm": self.rpm, "tpm": self.tpm},
+            "models": {model: limiter.stats() for model, limiter in self._limiters.items()},
+        }
+
+
+def gateway_from_env(cache: Optional[BaseCache] = None) -> LLMGateway:
+    return LLMGateway(
+        cache=cache,
+        fast_model=os.getenv("LLM_FAST_MODEL", "gemini-2.5-flash-lite"),
+        strong_model=os.getenv("LLM_STRONG_MODEL", "gemini-2.5-flash"),
+        rpm=float(os.getenv("LLM_RPM", "1000")),
+        tpm=float(os.getenv("LLM_TPM", "1000000")),
+        max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "5")),
+        base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0")),
+        max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "30")),
+    )
@@ -1,21 +1,75 @@
-from fastapi import FastAPI, HTTPException, Body
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, HTTPException, Body, Header, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+import asyncio
+import functools
+import importlib
 import json
 import os
+import sys
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
-# Import our modules
-from backend.models import MasterProfile
-from backend.pdf_generator import PDFGenerator
+# Import our modules. Only lightweight ones are imported here; the agent graph
+# (LangGraph, Gemini) and the PDF engines load in the background after startup
+# or on first use, so a cold start answers right away (see _warm_up).
+from backend.agent_loader import load_agents
+from backend.jobs import JobQueue, JobStore
+from backend.metrics import RunMetrics, render_prometheus
+from backend.pdf_cache import PDFCache, pdf_cache_key, template_fingerprint
+from backend.pdf_pool import DEFAULT_PDF_ENGINE, PDF_ENGINES, PDFPoolBusy, PDFRenderTimeout, shared_pool
+from backend.packet_export import merge_pdfs, packet_folder, render_in_order, stream_zip
+from backend.profile_store import ProfileStore
+from backend.runs import RunFailed, RunNotFound, RunStateError, RunStore, new_run_id
+from backend.singleflight import SingleFlight, request_key
 
-app = FastAPI(title="AI Career Suite Backend")
+# PDF exports and the pre-critic's page-count check render on a pre-warmed
+# process pool (PDF_RENDER_WORKERS=0 renders on a thread in this process instead).
+pdf_pool = shared_pool()
+pdf_cache = PDFCache(max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+
+# When false, nothing is preloaded and each subsystem loads on first use.
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "true").lower() not in ("0", "false", "no")
+
+async def _warm_up():
+    """Loads the agents, the LLM clients, the PDF workers and engines without holding up startup."""
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        run_store.start(),
+        asyncio.to_thread(pdf_pool.start),
+        asyncio.to_thread(importlib.import_module, "backend.reportlab_engine"),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Warm-up error: {result}")
+    try:
+        agents = await load_agents()
+        await asyncio.to_thread(agents.llm_gateway.warm_up)
+    except Exception as e:
+        # e.g. no API key yet; the first generation reports it properly.
+        print(f"Warm-up error: {e}")
+    print(f"Warm-up finished in {time.perf_counter() - started:.1f}s")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_queue.start()
+    warm_up = asyncio.create_task(_warm_up()) if WARM_UP_ON_STARTUP else None
+    yield
+    if warm_up is not None:
+        await warm_up
+    await job_queue.stop()
+    await run_store.stop()
+    pdf_pool.shutdown()
+
+app = FastAPI(title="AI Career Suite Backend", lifespan=lifespan)
 
 # CORS for local extension development
 app.add_middleware(
@@ -26,91 +80,500 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load Master Profile
+# Load Master Profile. The store re-reads the file when its mtime changes and
+# keeps the dict and prompt serializations precomputed between edits.
 PROFILE_PATH = "MasterProfile.json"
-try:
-    with open(PROFILE_PATH, "r") as f:
-        profile_data = json.load(f)
-        master_profile = MasterProfile(**profile_data)
-except Exception as e:
-    print(f"Error loading MasterProfile.json: {e}")
-    # Initialize empty or handle error
-    master_profile = None
+profile_store = ProfileStore(PROFILE_PATH)
+profile_store.get()
 
-pdf_gen = PDFGenerator()
+def _require_profile():
+    profile = profile_store.get()
+    if profile is None:
+        raise HTTPException(status_code=500, detail="Master profile not loaded")
+    return profile
 
 class ExportRequest(BaseModel):
     content: str
     type: str # 'resume' or 'cover_letter'
     company_name: Optional[str] = None
     date: Optional[str] = None
+    engine: Optional[str] = None # 'xhtml2pdf' or 'reportlab'; defaults to PDF_ENGINE
 
 @app.get("/")
 async def root():
     return {"message": "AI Career Suite Backend Running"}
 
+PDF_FILENAMES = {"resume": "Resume.pdf", "cover_letter": "CoverLetter.pdf"}
+
+def _resolve_engine(engine: Optional[str]) -> str:
+    engine = engine or DEFAULT_PDF_ENGINE
+    if engine not in PDF_ENGINES:
+        raise HTTPException(status_code=400, detail="Invalid PDF engine")
+    return engine
+
+def _export_key(profile, pdf_type: str, content: str, company: Optional[str], date_str: Optional[str], engine: str):
+    """Resolves a document's template inputs and returns them with its PDF cache key."""
+    if pdf_type == 'resume':
+        # Content is expected to be Markdown
+        template = "resume_markdown.html"
+        company = date_str = None
+    elif pdf_type == 'cover_letter':
+        template = "cover_letter.html"
+        date_str = date_str or datetime.now().strftime("%B %d, %Y")
+        company = company or "Hiring Team"
+    else:
+        raise HTTPException(status_code=400, detail="Invalid export type")
+    if engine == "xhtml2pdf":
+        layout_version = template_fingerprint(template)
+    else:
+        from backend.reportlab_engine import ENGINE_VERSION as layout_version
+    key = pdf_cache_key(pdf_type, content, company, date_str, profile.version, engine, layout_version)
+    return key, company, date_str
+
+async def _render_export(profile, pdf_type: str, content: str, company: Optional[str], date_str: Optional[str], engine: str, key: str) -> bytes:
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is None:
+        try:
+            if pdf_type == 'resume':
+                pdf_bytes = await pdf_pool.render_resume(content, profile.data, engine)
+            else:
+                pdf_bytes = await pdf_pool.render_cover_letter(profile.data, content, company, date_str, engine)
+        except PDFPoolBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except PDFRenderTimeout as e:
+            raise HTTPException(status_code=504, detail=str(e))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+        pdf_cache.put(key, pdf_bytes)
+    return pdf_bytes
+
 @app.post("/api/v1/export-pdf")
-async def export_pdf(request: ExportRequest):
-    if not master_profile:
-        raise HTTPException(status_code=500, detail="Master profile not loaded")
+async def export_pdf(request: ExportRequest, if_none_match: Optional[str] = Header(None)):
+    profile = _require_profile()
+    engine = _resolve_engine(request.engine)
 
-    try:
-        if request.type == 'resume':
-            # Generate Resume from Markdown content
-            # Content is expected to be Markdown
-            pdf_buffer = pdf_gen.generate_resume_from_markdown(request.content, master_profile.dict())
-            filename = "Resume.pdf"
-        
-        elif request.type == 'cover_letter':
-            # Generate Cover Letter from Text content
-            date_str = request.date or datetime.now().strftime("%B %d, %Y")
-            company = request.company_name or "Hiring Team"
-            pdf_buffer = pdf_gen.generate_cover_letter(master_profile.dict(), request.content, company, date_str)
-            filename = "CoverLetter.pdf"
-        
-        else:
-            raise HTTPException(status_code=400, detail="Invalid export type")
-
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+    # Identical exports (same content, profile and layout) reuse the rendered
+    # bytes, and the ETag lets the extension revalidate with If-None-Match.
+    key, company, date_str = _export_key(profile, request.type, request.content, request.company_name, request.date, engine)
+    etag = f'"{key[:32]}"'
+    if if_none_match and etag in if_none_match:
+        return Response(status_code=304, headers={"ETag": etag})
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    pdf_bytes = await _render_export(profile, request.type, request.content, company, date_str, engine, key)
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={PDF_FILENAMES[request.type]}", "ETag": etag}
+    )
 
-from backend.agents import agent_workflow
+class Packet(BaseModel):
+    resume: str # Markdown
+    cover_letter: str
+    company_name: Optional[str] = None
+    date: Optional[str] = None
 
-@app.post("/api/v1/generate")
-async def generate_drafts(job_description: str = Body(..., embed=True)):
+class PacketExportRequest(BaseModel):
+    packets: List[Packet]
+    format: str = "pdf" # 'pdf' (one merged PDF) or 'zip'
+    engine: Optional[str] = None
+
+PACKET_MAX_PACKETS = int(os.getenv("PACKET_MAX_PACKETS", "100"))
+# Documents rendered ahead of the one being sent; bounds a ZIP export's
+# memory to this many PDFs however many packets it holds. Capped at what the
+# pool accepts at once, so one export cannot trip PDFPoolBusy on its own.
+PACKET_RENDER_AHEAD = min(
+    int(os.getenv("PACKET_RENDER_AHEAD", str(max(pdf_pool.workers, 1) * 2))),
+    pdf_pool.capacity,
+)
+
+@app.post("/api/v1/export-packet")
+async def export_packet(request: PacketExportRequest):
     """
-    Generates resume and cover letter drafts using the AI Agent.
+    Renders the cover letter and resume of one or more applications in one
+    request, with the documents rendered concurrently on the PDF pool.
+
+    format=pdf returns one merged PDF (each cover letter followed by its
+    resume). format=zip streams a ZIP as the documents finish: CoverLetter.pdf
+    and Resume.pdf, inside one numbered folder per packet when there are
+    several.
     """
-    if not master_profile:
-        raise HTTPException(status_code=500, detail="Master profile not loaded")
+    profile = _require_profile()
+    engine = _resolve_engine(request.engine)
+    if not request.packets:
+        raise HTTPException(status_code=400, detail="No packets submitted")
+    if len(request.packets) > PACKET_MAX_PACKETS:
+        raise HTTPException(status_code=400, detail=f"At most {PACKET_MAX_PACKETS} packets per export")
+    if request.format not in ("pdf", "zip"):
+        raise HTTPException(status_code=400, detail="Invalid packet format")
+
+    documents = []
+    for i, packet in enumerate(request.packets):
+        folder = packet_folder(i, packet.company_name) + "/" if len(request.packets) > 1 else ""
+        for pdf_type, content in (("cover_letter", packet.cover_letter), ("resume", packet.resume)):
+            key, company, date_str = _export_key(profile, pdf_type, content, packet.company_name, packet.date, engine)
+            render = functools.partial(_render_export, profile, pdf_type, content, company, date_str, engine, key)
+            documents.append((folder + PDF_FILENAMES[pdf_type], render))
+
+    rendered = render_in_order((render for _, render in documents), PACKET_RENDER_AHEAD)
+    if request.format == "pdf":
+        try:
+            merged = await asyncio.to_thread(merge_pdfs, [data async for data in rendered])
+        finally:
+            await rendered.aclose()
+        return Response(
+            content=merged,
+            media_type="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=ApplicationPacket.pdf"}
+        )
+
+    # Wait for the first document so render errors that hit every document
+    # (a full pool, a bad engine) still come back as a proper HTTP error.
+    try:
+        first = await anext(rendered)
+    except BaseException:
+        await rendered.aclose()
+        raise
+
+    async def entries():
+        try:
+            yield documents[0][0], first
+            i = 1
+            async for data in rendered:
+                yield documents[i][0], data
+                i += 1
+        except HTTPException as e:
+            # Headers are already sent; the client sees a truncated archive.
+            print(f"Packet export aborted: {e.detail}")
+            raise
+        finally:
+            await rendered.aclose()
+
+    return StreamingResponse(
+        stream_zip(entries()),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=ApplicationPackets.zip"}
+    )
+
+@app.get("/api/v1/pdf-cache/stats")
+async def pdf_cache_stats():
+    return pdf_cache.stats()
 
-    # Invoke the agent
-    # We pass the profile and JD to the initial state
-    initial_state = {
+# Cap how many agent runs may be in flight per process. Each run is mostly
+# waiting on Gemini, so this can be well above the CPU count.
+MAX_CONCURRENT_GENERATIONS = int(os.getenv("MAX_CONCURRENT_GENERATIONS", "8"))
+generation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+# Identical JDs submitted concurrently (double-clicks, two tabs, several users
+# applying to the same posting) share one agent run.
+generation_flights = SingleFlight()
+
+# Every run is checkpointed after each graph step under its run ID, so failed
+# runs can be resumed and finished ones extended (see backend/runs.py).
+run_store = RunStore(
+    os.getenv("RUN_STORE_PATH", ".cache/runs.sqlite"),
+    profile_store,
+    max_runs=int(os.getenv("RUN_STORE_MAX_RUNS", "500")),
+    ttl_seconds=float(os.getenv("RUN_STORE_TTL_SECONDS", str(7 * 24 * 3600))),
+)
+
+# Per-request override of EXPERIENCE_MATCH_MODE: "llm" asks the Experience
+# Matcher, "local" ranks the profile with BM25 and skips that call.
+EXPERIENCE_MATCH_MODES = ("llm", "local")
+
+def _initial_state(job_description: str, profile, match_mode: Optional[str] = None) -> dict:
+    # Only the profile's version goes into the state; the run store passes
+    # the profile itself to the agents in the run config.
+    state = {
         "job_description": job_description,
-        "profile": master_profile.dict(),
+        "profile_version": profile.version,
         "resume_markdown": "",
         "cover_letter_text": ""
     }
+    if match_mode:
+        state["match_mode"] = match_mode
+    return state
+
+def _check_match_mode(match_mode: Optional[str]):
+    if match_mode is not None and match_mode not in EXPERIENCE_MATCH_MODES:
+        raise HTTPException(
+            status_code=400, detail=f"match_mode must be one of: {', '.join(EXPERIENCE_MATCH_MODES)}"
+        )
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _drafts(run_id: str, values: dict, run_metrics: Optional[RunMetrics] = None) -> dict:
+    drafts = {
+        "runId": run_id,
+        "resume": values.get("resume_markdown", ""),
+        "coverLetter": values.get("cover_letter_text", ""),
+        "matchScore": values.get("match_score"),
+        "reviewRounds": values.get("review_rounds", 0),
+    }
+    if run_metrics is not None:
+        drafts["timings"] = run_metrics.breakdown()
+    return drafts
+
+async def run_generation(
+    job_description: str,
+    profile,
+    timings: bool = False,
+    run_id: Optional[str] = None,
+    match_mode: Optional[str] = None,
+) -> dict:
+    """
+    Runs the agent graph for a JD under `run_id` (a new one by default). A run
+    ID that already has checkpoints continues from its last completed step.
+    `match_mode` overrides EXPERIENCE_MATCH_MODE for this run.
+    Errors are raised as RunFailed carrying the run ID.
+    """
+    async def run():
+        run_id_ = run_id or new_run_id()
+        # Run the graph without blocking the event loop
+        async with generation_semaphore:
+            run_metrics = RunMetrics()
+            try:
+                result = await run_store.run(
+                    run_id_, _initial_state(job_description, profile, match_mode), [run_metrics]
+                )
+            except Exception as e:
+                raise RunFailed(run_id_, e) from e
+            run_metrics.finish()
+            return run_id_, result, run_metrics
+
+    # An explicit run ID must end up holding its own checkpoints (a requeued
+    # batch job continues from them), so it only shares a flight with itself.
+    key = request_key(job_description, profile.version)
+    if match_mode:
+        key = f"{key}:{match_mode}"
+    if run_id is not None:
+        key = f"{key}:{run_id}"
+    run_id, result, run_metrics = await generation_flights.do(key, run)
+    return _drafts(run_id, result, run_metrics if timings else None)
+
+def _is_rate_limited(e: BaseException) -> bool:
+    # LLMRateLimited comes from the gateway, which loads with the agents; if
+    # that module is not loaded the error cannot be one.
+    gateway = sys.modules.get("backend.llm_gateway")
+    return isinstance(e, getattr(gateway, "LLMRateLimited", ()))
+
+def _generation_error(e: Exception) -> HTTPException:
+    """Maps an agent run failure to an HTTP error, exposing the run ID for /runs/{id}/resume."""
+    headers = {"X-Run-Id": e.run_id} if isinstance(e, RunFailed) else {}
+    cause = e.__cause__ if isinstance(e, RunFailed) else e
+    if _is_rate_limited(cause):
+        print(f"Agent generation rate limited: {cause}")
+        headers["Retry-After"] = str(max(int(cause.retry_after), 1))
+        return HTTPException(status_code=429, detail="Gemini rate limit exceeded, retry later", headers=headers)
+    print(f"Agent generation error: {e}")
+    return HTTPException(status_code=500, detail=str(e), headers=headers)
+
+@app.post("/api/v1/generate")
+async def generate_drafts(
+    job_description: str = Body(..., embed=True),
+    match_mode: Optional[str] = Body(None, embed=True),
+    timings: bool = Query(False),
+):
+    """
+    Generates resume and cover letter drafts using the AI Agent.
+    With ?timings=true the response also carries a per-node and per-LLM-call
+    timing breakdown of the run. The returned runId (also sent as X-Run-Id
+    when the run fails) addresses the run under /api/v1/runs. match_mode
+    "local" maps experience without the Experience Matcher call (faster).
+    """
+    _check_match_mode(match_mode)
+    profile = _require_profile()
 
     try:
-        # Run the graph
-        result = agent_workflow.invoke(initial_state)
-        
-        return {
-            "resume": result["resume_markdown"],
-            "coverLetter": result["cover_letter_text"]
-        }
+        return await run_generation(job_description, profile, timings, match_mode=match_mode)
     except Exception as e:
-        print(f"Agent generation error: {e}")
         # Build a fallback if LLM fails (e.g. no API key)
         # For now, raise detailed error
-        raise HTTPException(status_code=500, detail=str(e))
+        raise _generation_error(e)
+
+async def _run_operation(run_id: str, operation) -> dict:
+    try:
+        async with generation_semaphore:
+            run_metrics = RunMetrics()
+            values = await operation(run_id, [run_metrics])
+            run_metrics.finish()
+    except RunNotFound:
+        raise HTTPException(status_code=404, detail="Run not found")
+    except RunStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise _generation_error(RunFailed(run_id, e))
+    return _drafts(run_id, values, run_metrics)
+
+@app.get("/api/v1/runs/{run_id}")
+async def get_run(run_id: str):
+    try:
+        snapshot = await run_store.state(run_id)
+    except RunNotFound:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {
+        **_drafts(run_id, snapshot.values),
+        "status": "incomplete" if snapshot.next else "completed",
+        "pendingNodes": list(snapshot.next),
+    }
+
+@app.post("/api/v1/runs/{run_id}/resume")
+async def resume_run(run_id: str):
+    """Finishes a failed or interrupted run, re-executing only the nodes it did not complete."""
+    return await _run_operation(run_id, run_store.resume)
+
+@app.post("/api/v1/runs/{run_id}/cover-letter")
+async def regenerate_cover_letter(run_id: str):
+    """Rewrites just the cover letter of a finished run from its stored persona and requirement map."""
+    return await _run_operation(run_id, run_store.regenerate_cover_letter)
+
+@app.post("/api/v1/runs/{run_id}/review")
+async def review_run_again(run_id: str):
+    """Runs one more revise-and-review round on a finished run's resume."""
+    return await _run_operation(run_id, run_store.review_again)
+
+@app.get("/api/v1/llm-cache/stats")
+async def llm_cache_stats():
+    llm_cache = (await load_agents()).llm_cache
+    if llm_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **llm_cache.stats()}
+
+@app.get("/api/v1/jd-index/stats")
+async def jd_index_stats():
+    jd_index = (await load_agents()).jd_index
+    if jd_index is None:
+        return {"enabled": False}
+    return {"enabled": True, **jd_index.stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus exposition of node, LLM call and PDF render metrics for this process."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/v1/llm-gateway/stats")
+async def llm_gateway_stats():
+    return (await load_agents()).llm_gateway.stats()
+
+@app.post("/api/v1/generate/stream")
+async def generate_drafts_stream(
+    job_description: str = Body(..., embed=True),
+    match_mode: Optional[str] = Body(None, embed=True),
+):
+    """
+    Same as /api/v1/generate, but streams progress as server-sent events:
+    node_start / node_end per agent step, token chunks of both drafts,
+    the critic score after each review round and a final done event.
+    """
+    _check_match_mode(match_mode)
+    initial_state = _initial_state(job_description, _require_profile(), match_mode)
+    run_id = new_run_id()
+
+    async def event_stream():
+        yield _sse("run", {"run_id": run_id})
+        async with generation_semaphore:
+            run_metrics = RunMetrics()
+            try:
+                async for event, data in run_store.stream(run_id, initial_state, [run_metrics]):
+                    yield _sse(event, data)
+                run_metrics.finish()
+            except Exception as e:
+                if _is_rate_limited(e):
+                    print(f"Agent generation rate limited: {e}")
+                    yield _sse("error", {"detail": "Gemini rate limit exceeded, retry later", "retry_after": e.retry_after})
+                else:
+                    print(f"Agent generation error: {e}")
+                    yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# --- Batch generation ---
+
+class BatchJob(BaseModel):
+    job_description: str
+    company_name: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    jobs: List[BatchJob]
+    export_pdf: bool = False
+
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "100"))
+
+async def _run_batch_job(job_id: str, job_description: str) -> dict:
+    # The job ID doubles as the run ID, so a job interrupted by a restart
+    # resumes from its last checkpoint when the queue picks it up again.
+    return await run_generation(job_description, _require_profile(), run_id=job_id)
+
+async def _export_batch_job(job: dict, result: dict) -> dict:
+    profile = _require_profile()
+    date_str = datetime.now().strftime("%B %d, %Y")
+    resume, cover_letter = await asyncio.gather(
+        pdf_pool.render_resume(result["resume"], profile.data),
+        pdf_pool.render_cover_letter(
+            profile.data, result["coverLetter"], job["company_name"] or "Hiring Team", date_str
+        ),
+    )
+    return {"resume": resume, "cover_letter": cover_letter}
+
+# Jobs and results persist in SQLite; BATCH_CONCURRENCY bounds how many run
+# at once (each still goes through the generation semaphore).
+job_store = JobStore(os.getenv("JOB_STORE_PATH", ".cache/jobs.sqlite"))
+job_queue = JobQueue(
+    job_store,
+    generate=_run_batch_job,
+    export=_export_batch_job,
+    concurrency=int(os.getenv("BATCH_CONCURRENCY", "4")),
+)
+
+@app.post("/api/v1/batch", status_code=202)
+async def create_batch(request: BatchRequest):
+    """
+    Queues one generation job per job description and returns immediately.
+    Poll /api/v1/batch/{batch_id} or /api/v1/jobs/{job_id} for results.
+    """
+    _require_profile()
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="No jobs submitted")
+    if len(request.jobs) > BATCH_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_JOBS} jobs per batch")
+
+    batch_id, job_ids = await asyncio.to_thread(
+        job_store.create_batch, [job.model_dump() for job in request.jobs], request.export_pdf
+    )
+    job_queue.enqueue(job_ids)
+    return {"batch_id": batch_id, "job_ids": job_ids}
+
+@app.get("/api/v1/batch/{batch_id}")
+async def get_batch(batch_id: str):
+    jobs = await asyncio.to_thread(job_store.list_batch, batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    counts = {}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    return {"batch_id": batch_id, "counts": counts, "jobs": jobs}
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/api/v1/jobs/{job_id}/pdf/{pdf_type}")
+async def get_job_pdf(job_id: str, pdf_type: str):
+    data = await asyncio.to_thread(job_store.get_pdf, job_id, pdf_type)
+    if data is None:
+        raise HTTPException(status_code=404, detail="PDF not found")
+    filename = "Resume.pdf" if pdf_type == "resume" else "CoverLetter.pdf"
+    return Response(
+        content=data,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
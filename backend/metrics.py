@@ -0,0 +1,228 @@
+import threading
+import time
+from typing import Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Latency buckets in seconds, from cache hits up to slow LLM calls.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+SIZE_BUCKETS = (500, 1000, 2500, 5000, 10000, 20000, 40000, 80000)
+
+# Every metric registers itself here; /metrics renders them in order.
+REGISTRY: list = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> (per-bucket counts, sum, count)
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                le_names = self.labelnames + ("le",)
+                for bound, n in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_label_str(le_names, key + (_fmt(bound),))} {n}")
+                lines.append(f"{self.name}_bucket{_label_str(le_names, key + ('+Inf',))} {count}")
+                lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {_fmt(total)}")
+                lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {count}")
+        return lines
+
+
+GENERATION_SECONDS = Histogram("jobhunt_generation_seconds", "Wall time of a full agent run.")
+NODE_SECONDS = Histogram("jobhunt_node_seconds", "Wall time of each LangGraph node.", ("node",))
+LLM_CALL_SECONDS = Histogram(
+    "jobhunt_llm_call_seconds", "Wall time of each LLM call, including cache hits.", ("node", "model", "cached")
+)
+LLM_PROMPT_CHARS = Histogram(
+    "jobhunt_llm_prompt_chars", "Rendered prompt length of each LLM call in characters.", ("node",), SIZE_BUCKETS
+)
+LLM_CALLS = Counter("jobhunt_llm_calls_total", "LLM calls by node and whether the cache answered.", ("node", "model", "cached"))
+LLM_ERRORS = Counter("jobhunt_llm_errors_total", "LLM calls that raised.", ("node", "model"))
+LLM_TOKENS = Counter("jobhunt_llm_tokens_total", "Tokens reported by the model.", ("node", "model", "direction"))
+LLM_RETRIES = Counter("jobhunt_llm_retries_total", "LLM calls retried by the gateway.", ("node", "model"))
+LLM_RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "jobhunt_llm_rate_limit_wait_seconds", "Time spent waiting for RPM/TPM budget before a call.", ("model",)
+)
+JD_INDEX_LOOKUPS = Counter(
+    "jobhunt_jd_index_lookups_total", "Near-duplicate JD lookups: hit, persona_only (profile changed) or miss.",
+    ("result",),
+)
+PDF_RENDER_SECONDS = Histogram(
+    "jobhunt_pdf_render_seconds", "Time a PDF generator spent rendering one document.", ("engine", "document")
+)
+PDF_EXPORT_SECONDS = Histogram(
+    "jobhunt_pdf_export_seconds", "Time from submitting a render to receiving the PDF, including queueing.",
+    ("engine", "document"),
+)
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _is_cache_hit(message) -> bool:
+    # langchain-core zeroes total_cost on generations it replays from the
+    # cache; responses from the API never carry that key.
+    usage = getattr(message, "usage_metadata", None) or {}
+    return "total_cost" in usage
+
+
+class RunMetrics(BaseCallbackHandler):
+    """
+    Callback handler for one agent run. Records every graph node and LLM call
+    into the process-wide histograms above and keeps a per-run breakdown that
+    /generate can return to the caller.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.nodes: list[dict] = []
+        self.llm_calls: list[dict] = []
+        self._open: dict[UUID, dict] = {}
+
+    def _offset(self) -> float:
+        return round(time.perf_counter() - self.started, 4)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node:
+            self._open[run_id] = {"node": node, "start": self._offset(), "t0": time.perf_counter()}
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        entry = self._open.pop(run_id, None)
+        if entry is not None:
+            self._close_node(entry)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        entry = self._open.pop(run_id, None)
+        if entry is not None:
+            self._close_node(entry, error=True)
+
+    def _close_node(self, entry: dict, error: bool = False):
+        seconds = time.perf_counter() - entry.pop("t0")
+        NODE_SECONDS.observe(seconds, node=entry["node"])
+        entry["seconds"] = round(seconds, 4)
+        if error:
+            entry["error"] = True
+        self.nodes.append(entry)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        metadata = metadata or {}
+        node = metadata.get("langgraph_node", "")
+        prompt_chars = sum(len(m.content) if isinstance(m.content, str) else len(str(m.content)) for batch in messages for m in batch)
+        LLM_PROMPT_CHARS.observe(prompt_chars, node=node)
+        self._open[run_id] = {
+            "node": node,
+            "model": metadata.get("ls_model_name", "unknown"),
+            "prompt_chars": prompt_chars,
+            "start": self._offset(),
+            "t0": time.perf_counter(),
+        }
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        call = self._open.pop(run_id, None)
+        if call is None:
+            return
+        seconds = time.perf_counter() - call.pop("t0")
+        generations = response.generations[0] if response.generations else []
+        message = getattr(generations[0], "message", None) if generations else None
+        usage = getattr(message, "usage_metadata", None) or {}
+        cached = _is_cache_hit(message)
+        labels = {"node": call["node"], "model": call["model"]}
+        LLM_CALL_SECONDS.observe(seconds, cached=str(cached).lower(), **labels)
+        LLM_CALLS.inc(cached=str(cached).lower(), **labels)
+        if not cached:
+            LLM_TOKENS.inc(usage.get("input_tokens", 0), direction="input", **labels)
+            LLM_TOKENS.inc(usage.get("output_tokens", 0), direction="output", **labels)
+        call.update({
+            "seconds": round(seconds, 4),
+            "cached": cached,
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            # Transient failures the gateway retried before this response (see GatewayChatModel).
+            "retries": 0 if cached else (getattr(message, "response_metadata", None) or {}).get("retries", 0),
+        })
+        self.llm_calls.append(call)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        call = self._open.pop(run_id, None)
+        if call is not None:
+            LLM_ERRORS.inc(node=call["node"], model=call["model"])
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        GENERATION_SECONDS.observe(self.finished - self.started)
+
+    def breakdown(self) -> dict:
+        end = self.finished or time.perf_counter()
+        return {
+            "total_seconds": round(end - self.started, 4),
+            "nodes": self.nodes,
+            "llm_calls": self.llm_calls,
+            "input_tokens": sum(c["input_tokens"] for c in self.llm_calls if not c["cached"]),
+            "output_tokens": sum(c["output_tokens"] for c in self.llm_calls if not c["cached"]),
+            "llm_retries": sum(c["retries"] for c in self.llm_calls),
+        }
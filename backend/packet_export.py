@@ -0,0 +1,84 @@
+import asyncio
+import io
+import re
+import zipfile
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._ -]+")
+
+
+class _ChunkSink:
+    """
+    Write-only, unseekable file object for ZipFile. Whatever the archive
+    writes is held until take() hands it to the response, so only the entry
+    being written is ever in memory.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def render_in_order(renders: Iterable[Callable[[], Awaitable[bytes]]], ahead: int) -> AsyncIterator[bytes]:
+    """
+    Starts up to `ahead` renders at once and yields their results in
+    submission order, starting the next render as each result is taken. At
+    most `ahead` finished documents wait in memory. Pending renders are
+    cancelled if the consumer stops early (e.g. the client disconnected).
+    """
+    pending: deque[asyncio.Task] = deque()
+    renders = iter(renders)
+    try:
+        while True:
+            while len(pending) < max(ahead, 1):
+                render = next(renders, None)
+                if render is None:
+                    break
+                pending.append(asyncio.ensure_future(render()))
+            if not pending:
+                return
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def stream_zip(entries: AsyncIterator[tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """Yields a ZIP archive of `entries` piece by piece as each entry arrives."""
+    sink = _ChunkSink()
+    # PDFs are already compressed; storing them keeps the archive cheap to build.
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        async for name, data in entries:
+            archive.writestr(name, data)
+            yield sink.take()
+    yield sink.take()
+
+
+def merge_pdfs(documents: Iterable[bytes]) -> bytes:
+    # Imported here: only merged packet exports need pypdf.
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for data in documents:
+        writer.append(io.BytesIO(data))
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def packet_folder(index: int, name: Optional[str]) -> str:
+    """Folder name for one packet inside the ZIP, e.g. "03 Acme Corp"."""
+    cleaned = _UNSAFE_NAME_RE.sub("", name or "").strip(" .")[:60]
+    return f"{index + 1:02d} {cleaned}" if cleaned else f"{index + 1:02d}"
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from backend.metrics import PDF_EXPORT_SECONDS, PDF_RENDER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# "xhtml2pdf" renders the Jinja/HTML templates; "reportlab" builds the layout
+# directly from the Markdown tree (see backend/reportlab_engine.py).
+PDF_ENGINES = ("xhtml2pdf", "reportlab")
+DEFAULT_PDF_ENGINE = os.getenv("PDF_ENGINE", "xhtml2pdf")
+
+# --- Worker side ---
+# Each worker process imports reportlab/xhtml2pdf and loads the Jinja
+# templates once in its initializer, then reuses them for every render.
+
+_worker_gens = {}
+
+
+def _init_worker(template_dir: Optional[str]):
+    from backend.pdf_generator import PDFGenerator
+    from backend.reportlab_engine import ReportLabGenerator
+    pisa_gen = PDFGenerator(template_dir)
+    for name in ("resume_markdown.html", "cover_letter.html"):
+        pisa_gen.env.get_template(name)
+    _worker_gens.update({"xhtml2pdf": pisa_gen, "reportlab": ReportLabGenerator()})
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+# Renders return (pdf_bytes, seconds spent in the generator) so the parent can
+# tell render time apart from queueing and IPC.
+
+def _render_resume(engine: str, markdown_content: str, profile_data: dict) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    data = _worker_gens[engine].generate_resume_from_markdown(markdown_content, profile_data).getvalue()
+    return data, time.perf_counter() - started
+
+
+def _render_cover_letter(engine: str, profile_data: dict, content: str, company_name: str, date: str) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    data = _worker_gens[engine].generate_cover_letter(profile_data, content, company_name, date).getvalue()
+    return data, time.perf_counter() - started
+
+
+class PDFPoolBusy(Exception):
+    """Raised when the render queue is full."""
+
+
+class PDFRenderTimeout(Exception):
+    """Raised when a render does not finish within the pool's timeout."""
+
+
+class PDFRenderPool:
+    """
+    Renders PDFs on a pre-warmed process pool so xhtml2pdf's CPU-bound layout
+    neither blocks the event loop nor stays on one core.
+
+    At most `workers + max_queue` renders are accepted at once; further calls
+    fail fast with PDFPoolBusy. A render that exceeds `timeout` seconds raises
+    PDFRenderTimeout to the caller (the worker finishes it in the background).
+    With `workers=0` renders run on a thread in the current process instead.
+    """
+
+    def __init__(self, workers: int, max_queue: int = 16, timeout: float = 30.0, template_dir: Optional[str] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.template_dir = template_dir
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """
+        Spawns and warms the workers (or, with workers=0, loads the engines in
+        this process). Blocking; the app runs it on a thread after startup,
+        and the first render does so if that has not happened yet.
+        """
+        with self._start_lock:
+            if self.workers <= 0:
+                if not _worker_gens:
+                    _init_worker(self.template_dir)
+                return
+            if self._executor is not None:
+                return
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # Forking a process that already runs an event loop and HTTP
+                # clients is unsafe, so workers start from a clean interpreter.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.template_dir,),
+            )
+            # Spawn every worker now so the first export does not pay for it.
+            for future in [executor.submit(_warmup) for _ in range(self.workers)]:
+                future.result()
+            self._executor = executor
+
+    @property
+    def capacity(self) -> int:
+        """Renders accepted at once (running plus queued) before PDFPoolBusy."""
+        return max(self.workers, 1) + self.max_queue
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render_resume(
+        self, markdown_content: str, profile_data: dict, engine: str = DEFAULT_PDF_ENGINE, document: str = "resume"
+    ) -> bytes:
+        # `document` only labels the render metrics, e.g. "resume_check" for the pre-critic.
+        return await self._submit(document, _render_resume, engine, markdown_content, profile_data)
+
+    async def render_cover_letter(
+        self, profile_data: dict, content: str, company_name: str, date: str, engine: str = DEFAULT_PDF_ENGINE
+    ) -> bytes:
+        return await self._submit("cover_letter", _render_cover_letter, engine, profile_data, content, company_name, date)
+
+    async def _submit(self, document: str, fn, engine: str, *args) -> bytes:
+        if self._pending >= self.capacity:
+            raise PDFPoolBusy("PDF render queue is full")
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            try:
+                data, render_seconds = await self._render(fn, engine, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory). _render dropped the
+                # broken executor, so this starts a fresh pool; retried once.
+                data, render_seconds = await self._render(fn, engine, *args)
+            PDF_RENDER_SECONDS.observe(render_seconds, engine=engine, document=document)
+            PDF_EXPORT_SECONDS.observe(time.perf_counter() - started, engine=engine, document=document)
+            return data
+        except asyncio.TimeoutError:
+            raise PDFRenderTimeout(f"PDF render exceeded {self.timeout:.0f}s")
+        finally:
+            self._pending -= 1
+
+    async def _render(self, fn, engine: str, *args) -> tuple[bytes, float]:
+        if self._executor is None and (self.workers > 0 or not _worker_gens):
+            await asyncio.to_thread(self.start)
+        executor = self._executor
+        if executor is None:
+            return await asyncio.wait_for(asyncio.to_thread(fn, engine, *args), self.timeout)
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, fn, engine, *args)
+            return await asyncio.wait_for(future, self.timeout)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        # Renders that were in flight on the same executor all fail at once;
+        # only the first drops it, so none of them discards its replacement.
+        with self._start_lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.warning("A PDF render worker died; restarting the pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def pool_from_env(template_dir: Optional[str] = None) -> PDFRenderPool:
+    return PDFRenderPool(
+        workers=int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1))),
+        max_queue=int(os.getenv("PDF_RENDER_QUEUE", "16")),
+        timeout=float(os.getenv("PDF_RENDER_TIMEOUT", "30")),
+        template_dir=template_dir,
+    )
+
+
+_shared_pool: Optional[PDFRenderPool] = None
+
+
+def shared_pool() -> PDFRenderPool:
+    """The process's pool, used by both PDF exports and the pre-critic's page-count check."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = pool_from_env()
+    return _shared_pool
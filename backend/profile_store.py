@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from backend.models import MasterProfile
+
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """One loaded version of MasterProfile.json and its precomputed forms."""
+    model: MasterProfile
+    data: dict
+    # Compact JSON used inside prompts (no indentation, None fields dropped).
+    prompt_json: str
+    version: str
+    mtime: float
+
+
+def compact_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class ProfileStore:
+    """
+    Holds the parsed MasterProfile and reloads it when the file's mtime changes,
+    so edits take effect without restarting the server. If a reload fails
+    (e.g. the file is mid-edit and not valid JSON) the previous snapshot is kept.
+
+    The last few versions stay available through get_version(), so a run
+    started just before an edit can still be resumed with its own profile.
+    """
+
+    def __init__(self, path: str, versions_kept: int = 8):
+        self.path = path
+        self.versions_kept = versions_kept
+        self._snapshot: Optional[ProfileSnapshot] = None
+        self._versions: OrderedDict[str, ProfileSnapshot] = OrderedDict()
+        self._failed_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[ProfileSnapshot]:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            if self._snapshot is None:
+                print(f"Error loading {self.path}: {e}")
+            return self._snapshot
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot.mtime == mtime) or mtime == self._failed_mtime:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.mtime != mtime:
+                self._reload(mtime)
+            return self._snapshot
+
+    def get_version(self, version: str) -> Optional[ProfileSnapshot]:
+        """The snapshot with this version, if it is current or one of the recently replaced ones."""
+        current = self.get()
+        if current is not None and current.version == version:
+            return current
+        return self._versions.get(version)
+
+    def _reload(self, mtime: float) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            model = MasterProfile(**json.loads(raw))
+        except Exception as e:
+            print(f"Error loading {self.path}: {e}")
+            self._failed_mtime = mtime
+            return
+        self._failed_mtime = None
+        self._snapshot = ProfileSnapshot(
+            model=model,
+            data=model.model_dump(),
+            prompt_json=compact_json(model.model_dump(exclude_none=True)),
+            version=hashlib.sha256(raw).hexdigest()[:16],
+            mtime=mtime,
+        )
+        self._versions[self._snapshot.version] = self._snapshot
+        self._versions.move_to_end(self._snapshot.version)
+        while len(self._versions) > self.versions_kept:
+            self._versions.popitem(last=False)
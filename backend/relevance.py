@@ -0,0 +1,199 @@
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+# Keeps tech tokens like "c++20", "node.js" and "ci/cd" pieces intact.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_METRIC_RE = re.compile(r"~?\$?\d[\d,.]*\s?(?:%|x|k|m|ms|s|\+)?(?:\s+[A-Za-z-]+){0,2}")
+
+_STOPWORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could did do
+does doing for from had has have having how i if in into is it its itself just more most of on once only
+or other our out over own same should so some such than that the their them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with
+would you your yours work working experience team teams role ability strong years year plus using use
+""".split())
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip(".")
+        if len(token) > 1 and token not in _STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+@dataclass
+class ProfileEntry:
+    kind: str  # "work", "project" or "skill"
+    id: str
+    position: int  # index within its profile list
+    text: str
+    length: int = 0
+
+
+@dataclass
+class RankedEntry:
+    entry: ProfileEntry
+    score: float
+    matched_terms: list[str] = field(default_factory=list)
+
+
+class RelevanceIndex:
+    """
+    BM25 index over the profile's work achievements, project highlights and
+    tech stacks, and individual skills. Built once per profile version; scoring
+    a job description is a walk over the inverted index for the JD's terms.
+    """
+
+    def __init__(self, entries: list[ProfileEntry]):
+        self.entries = entries
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for doc_id, entry in enumerate(entries):
+            counts = Counter(tokenize(entry.text))
+            entry.length = sum(counts.values())
+            for term, tf in counts.items():
+                self.postings[term].append((doc_id, tf))
+        n_docs = len(entries)
+        self.avg_length = sum(e.length for e in entries) / n_docs if n_docs else 0.0
+        self.idf = {
+            term: math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    @classmethod
+    def from_profile(cls, profile: dict) -> "RelevanceIndex":
+        entries = []
+        for i, work in enumerate(profile.get("work_experience", [])):
+            entries.append(ProfileEntry(
+                kind="work",
+                id=f"{work['role']} at {work['company']}",
+                position=i,
+                text=" ".join([work["role"], work["company"], *work.get("achievements", [])]),
+            ))
+        for i, project in enumerate(profile.get("technical_projects", [])):
+            # Tech stack is listed twice to weight it above free-text highlights.
+            stack = " ".join(project.get("tech_stack", []))
+            entries.append(ProfileEntry(
+                kind="project",
+                id=project["title"],
+                position=i,
+                text=" ".join([project["title"], stack, stack, *project.get("highlights", [])]),
+            ))
+        position = 0
+        for skills in (profile.get("skills") or {}).values():
+            for skill in skills or []:
+                entries.append(ProfileEntry(kind="skill", id=skill, position=position, text=skill))
+                position += 1
+        return cls(entries)
+
+    def rank(self, query: str, kinds: tuple[str, ...] = ("work", "project")) -> list[RankedEntry]:
+        scores: dict[int, float] = defaultdict(float)
+        matched: dict[int, list[str]] = defaultdict(list)
+        for term, qtf in Counter(tokenize(query)).items():
+            for doc_id, tf in self.postings.get(term, ()):
+                entry = self.entries[doc_id]
+                if entry.kind not in kinds:
+                    continue
+                norm = 1 - BM25_B + BM25_B * entry.length / (self.avg_length or 1)
+                # Repeated JD terms count, but saturate quickly.
+                weight = 1 + math.log(qtf)
+                scores[doc_id] += weight * self.idf[term] * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+                matched[doc_id].append(term)
+        ranked = [
+            RankedEntry(self.entries[doc_id], score, sorted(matched[doc_id]))
+            for doc_id, score in scores.items()
+        ]
+        ranked.sort(key=lambda r: r.score, reverse=True)
+        # Entries with no overlap still belong at the bottom of the ranking.
+        seen = {id(r.entry) for r in ranked}
+        ranked.extend(
+            RankedEntry(e, 0.0) for e in self.entries if e.kind in kinds and id(e) not in seen
+        )
+        return ranked
+
+
+_indexes: dict[str, RelevanceIndex] = {}
+
+
+def index_for(profile: dict, version: str = "") -> RelevanceIndex:
+    """Returns the cached index for a profile version, building it on first use."""
+    if not version:
+        return RelevanceIndex.from_profile(profile)
+    index = _indexes.get(version)
+    if index is None:
+        _indexes.clear()
+        index = _indexes[version] = RelevanceIndex.from_profile(profile)
+    return index
+
+
+def _metrics(texts: list[str]) -> list[str]:
+    found = []
+    for text in texts:
+        for match in _METRIC_RE.finditer(text):
+            words = match.group(0).split()
+            while len(words) > 1 and words[-1].lower() in _STOPWORDS:
+                words.pop()
+            metric = " ".join(words)
+            # Skip bare numbers such as years; keep "20% accuracy", "10,000+ word".
+            if any(c.isalpha() or c in "%+" for c in metric):
+                found.append(metric)
+    return found
+
+
+def build_requirement_map(
+    profile: dict,
+    ranked: list[RankedEntry],
+    matched_skills: list[RankedEntry] = (),
+    max_entries: int = 7,
+    min_entries: int = 5,
+) -> dict:
+    """
+    Local replacement for the Experience Matcher's output: every work entry plus
+    the best-scoring projects, up to `max_entries` total, in the same JSON shape
+    the ghostwriter prompts already consume.
+    """
+    works = [r for r in ranked if r.entry.kind == "work"]
+    projects = [r for r in ranked if r.entry.kind == "project"]
+    room = max(max_entries - len(works), 0)
+    chosen_projects = [r for r in projects[:room] if r.score > 0]
+    if len(works) + len(chosen_projects) < min_entries:
+        chosen_projects = projects[:max(min_entries - len(works), len(chosen_projects))]
+
+    selected = []
+    for r in works + chosen_projects:
+        if r.entry.kind == "work":
+            texts = profile["work_experience"][r.entry.position].get("achievements", [])
+        else:
+            texts = profile["technical_projects"][r.entry.position].get("highlights", [])
+        reasoning = (
+            f"Matches JD terms: {', '.join(r.matched_terms[:6])}." if r.matched_terms
+            else "Included for coverage."
+        )
+        selected.append({
+            "id": r.entry.id,
+            "reasoning": reasoning,
+            "key_metrics_to_include": _metrics(texts)[:3],
+        })
+    return {
+        "selected_entries": selected,
+        "matched_skills": [r.entry.id for r in matched_skills if r.score > 0],
+    }
+
+
+def prune_profile(profile: dict, ranked: list[RankedEntry], top_k: int) -> dict:
+    """
+    Copy of the profile keeping only the `top_k` highest-ranked technical
+    projects (in their original order). Work experience is kept in full because
+    the resume writer is required to cover every role.
+    """
+    projects = [r for r in ranked if r.entry.kind == "project"]
+    keep = sorted(r.entry.position for r in projects[:top_k])
+    pruned = dict(profile)
+    pruned["technical_projects"] = [profile["technical_projects"][i] for i in keep]
+    return pruned
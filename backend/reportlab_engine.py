@@ -0,0 +1,222 @@
+import re
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+import markdown
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import HTML_PLACEHOLDER_RE
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (
+    BaseDocTemplate, Frame, HRFlowable, PageTemplate, Paragraph, Spacer, Table, TableStyle,
+)
+
+# Bumped whenever the layout below changes, so cached PDFs are invalidated.
+ENGINE_VERSION = "1"
+
+_SPAN_RE = re.compile(r"<span[^>]*>(.*?)</span>", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+class _CaptureTree(Treeprocessor):
+    """Keeps the final ElementTree so it can be walked instead of serialized."""
+
+    def run(self, root):
+        self.md.captured_root = root
+
+
+class _CaptureTreeExtension(markdown.Extension):
+    def extendMarkdown(self, md):
+        # Lowest priority: runs after inline patterns have been applied.
+        md.treeprocessors.register(_CaptureTree(md), "capture_tree", -100)
+
+
+def _document(buffer: BytesIO, margin: float) -> BaseDocTemplate:
+    """Letter page whose content box is exactly the page minus `margin`, like CSS @page."""
+    doc = BaseDocTemplate(buffer, pagesize=letter, leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=margin)
+    frame = Frame(
+        doc.leftMargin, doc.bottomMargin, doc.width, doc.height,
+        leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0,
+    )
+    doc.addPageTemplates([PageTemplate(id="page", frames=[frame])])
+    return doc
+
+
+def _styles() -> dict:
+    base = dict(fontName="Helvetica", fontSize=9.5, leading=10.45, textColor=colors.black)
+    return {
+        "name": ParagraphStyle("name", fontName="Helvetica-Bold", fontSize=16, leading=18, alignment=TA_CENTER),
+        "contact": ParagraphStyle("contact", fontName="Helvetica", fontSize=8.5, leading=10, alignment=TA_CENTER, spaceAfter=2),
+        "h2": ParagraphStyle("h2", fontName="Helvetica-Bold", fontSize=10.5, leading=12, spaceBefore=7, spaceAfter=0),
+        "h3": ParagraphStyle("h3", **{**base, "fontName": "Helvetica-Bold"}),
+        "dates": ParagraphStyle("dates", fontName="Helvetica", fontSize=8.5, leading=10.45, alignment=TA_RIGHT),
+        "body": ParagraphStyle("body", **base, spaceAfter=1),
+        "summary": ParagraphStyle("summary", **{**base, "fontSize": 9, "leading": 9.9}, alignment=TA_JUSTIFY, spaceBefore=2, spaceAfter=2),
+        "sub": ParagraphStyle("sub", fontName="Helvetica-Oblique", fontSize=8.5, leading=9.5, textColor=colors.HexColor("#333333"), spaceAfter=1),
+        "bullet": ParagraphStyle("bullet", **base, leftIndent=14, bulletIndent=4, spaceAfter=1),
+    }
+
+
+class ReportLabGenerator:
+    """
+    Builds resume and cover-letter PDFs directly as ReportLab platypus
+    flowables, skipping the HTML/CSS layout pass of xhtml2pdf. Exposes the same
+    generate_* methods as PDFGenerator so callers can switch engines freely.
+    """
+
+    def __init__(self):
+        self.styles = _styles()
+
+    # --- Inline markup ---
+
+    def _inline(self, el, md) -> str:
+        """Serializes an element's content to ReportLab's paragraph mini-markup."""
+        parts = [self._text(el.text, md)]
+        for child in el:
+            inner = self._inline(child, md)
+            tag = child.tag
+            if tag in ("strong", "b"):
+                parts.append(f"<b>{inner}</b>")
+            elif tag in ("em", "i"):
+                parts.append(f"<i>{inner}</i>")
+            elif tag == "code":
+                parts.append(f'<font name="Courier">{inner}</font>')
+            elif tag == "a":
+                parts.append(f'<link href="{escape(child.get("href", ""))}">{inner}</link>')
+            elif tag == "br":
+                parts.append("<br/>")
+            else:
+                parts.append(inner)
+            parts.append(self._text(child.tail, md))
+        return "".join(parts)
+
+    @staticmethod
+    def _text(text, md) -> str:
+        if not text:
+            return ""
+        # Raw inline HTML (e.g. <span>Dates</span>) is stashed behind
+        # placeholders; put it back escaped so spans can be split out later.
+        def restore(match):
+            return escape(md.htmlStash.rawHtmlBlocks[int(match.group(1))])
+        return HTML_PLACEHOLDER_RE.sub(restore, escape(text))
+
+    @staticmethod
+    def _unescape_spans(markup: str) -> str:
+        return markup.replace("&lt;span&gt;", "<span>").replace("&lt;/span&gt;", "</span>")
+
+    # --- Resume ---
+
+    def _heading_row(self, markup: str, width: float):
+        markup = self._unescape_spans(markup)
+        dates = ""
+        match = _SPAN_RE.search(markup)
+        if match:
+            dates = match.group(1).strip()
+            markup = (markup[:match.start()] + markup[match.end():]).strip()
+        markup = _TAG_RE.sub(lambda m: m.group(0) if m.group(0) in ("<b>", "</b>", "<i>", "</i>") else "", markup)
+        # Size the dates column to its text so it stays on one line, like the
+        # right-floated span in the HTML template.
+        dates_style = self.styles["dates"]
+        plain_dates = _TAG_RE.sub("", dates).replace("&amp;", "&")
+        dates_width = min(stringWidth(plain_dates, dates_style.fontName, dates_style.fontSize) + 4, width * 0.5)
+        table = Table(
+            [[Paragraph(markup, self.styles["h3"]), Paragraph(dates, dates_style)]],
+            colWidths=[width - dates_width, dates_width],
+        )
+        table.setStyle(TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "BOTTOM"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 0),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+            ("TOPPADDING", (0, 0), (-1, -1), 5),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+        ]))
+        return table
+
+    def _resume_body(self, root, md, width: float) -> list:
+        s = self.styles
+        story = []
+        section = ""
+        for el in root:
+            if el.tag == "h2":
+                section = "".join(el.itertext()).strip().lower()
+                story.append(Paragraph(self._inline(el, md).upper(), s["h2"]))
+                story.append(HRFlowable(width="100%", thickness=0.75, color=colors.black, spaceBefore=1, spaceAfter=4))
+            elif el.tag in ("h3", "h4"):
+                story.append(self._heading_row(self._inline(el, md), width))
+            elif el.tag in ("ul", "ol"):
+                for li in el.iter("li"):
+                    story.append(Paragraph(self._inline(li, md), s["bullet"], bulletText="•"))
+                story.append(Spacer(1, 2))
+            elif el.tag == "p":
+                markup = self._inline(el, md)
+                # A paragraph that is only emphasis is the location/tech line.
+                only_em = len(el) >= 1 and not (el.text or "").strip() and el[0].tag in ("em", "i") and all(
+                    c.tag in ("em", "i", "br") and not (c.tail or "").strip() for c in el
+                )
+                if only_em:
+                    style = s["sub"]
+                elif section == "summary":
+                    style = s["summary"]
+                else:
+                    style = s["body"]
+                story.append(Paragraph(markup, style))
+            elif el.tag == "hr":
+                story.append(HRFlowable(width="100%", thickness=0.5, color=colors.black, spaceBefore=2, spaceAfter=2))
+        return story
+
+    def generate_resume_from_markdown(self, markdown_content: str, profile_data: dict) -> BytesIO:
+        md = markdown.Markdown(extensions=["nl2br", _CaptureTreeExtension()])
+        md.convert(markdown_content)
+
+        buffer = BytesIO()
+        doc = _document(buffer, 0.4 * inch)
+        contact = profile_data.get("contact", {})
+        links = [
+            f'<link href="https://{escape(contact[key])}">{escape(contact[key])}</link>'
+            for key in ("linkedin", "github") if contact.get(key)
+        ]
+        if contact.get("website"):
+            links.append(f'<link href="{escape(contact["website"])}">{escape(contact["website"])}</link>')
+        contact_line = " | ".join(escape(contact.get(k, "")) for k in ("phone", "email", "location"))
+        story = [
+            Paragraph(escape(contact.get("name", "")).upper(), self.styles["name"]),
+            Paragraph(f"{contact_line}<br/>{' | '.join(links)}", self.styles["contact"]),
+        ]
+        story += self._resume_body(md.captured_root, md, doc.width)
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
+
+    # --- Cover letter ---
+
+    def generate_cover_letter(self, profile_data: dict, cover_letter_content: str, company_name: str, date: str) -> BytesIO:
+        base = dict(fontName="Times-Roman", fontSize=11, leading=16.5)
+        body = ParagraphStyle("cl_body", **base)
+        content = ParagraphStyle("cl_content", **base, spaceAfter=16.5)
+        name = ParagraphStyle("cl_name", fontName="Times-Bold", fontSize=16, leading=20, spaceAfter=12)
+        contact_style = ParagraphStyle("cl_contact", **base, spaceAfter=6)
+
+        buffer = BytesIO()
+        doc = _document(buffer, inch)
+        contact = profile_data.get("contact", {})
+        story = [
+            Paragraph(escape(contact.get("name", "")), name),
+            Paragraph(f"{escape(contact.get('email', ''))} | {escape(contact.get('phone', ''))}", contact_style),
+            Paragraph(" | ".join(escape(contact.get(k) or "") for k in ("linkedin", "github", "website")), contact_style),
+            Paragraph(escape(date), body),
+            Spacer(1, 36),
+        ]
+        text = cover_letter_content.replace("\r\n", "\n").strip()
+        for block in re.split(r"\n\s*\n", text):
+            story.append(Paragraph(escape(block).replace("\n", "<br/>"), content))
+        story += [
+            Spacer(1, 24),
+            Paragraph(f"Sincerely,<br/><br/>{escape(contact.get('name', ''))}", body),
+        ]
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
@@ -0,0 +1,134 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from backend.resume_validator import HEADING_RE
+
+# Validator findings that concern the resume as a whole; a targeted rewrite
+# of individual sections cannot fix them.
+GLOBAL_ISSUE_CODES = {"missing_section", "missing_role", "over_one_page"}
+
+KEY_SEPARATOR = " > "
+
+# A partial reference must share whole words with an entry title, and at least
+# this many characters of them, e.g. "Finz" for "AI Engineering Intern at Finz".
+MIN_PARTIAL_MATCH_CHARS = 4
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class ResumeBlock:
+    """A `##` section header (with any text before its first entry) or one `###` entry."""
+
+    key: str  # "Skills" or "Work Experience > Role at Company"; "" for text before the first section
+    section: str
+    text: str  # the exact source lines, so joining all blocks reproduces the document
+
+
+def entry_title(heading_line: str) -> str:
+    match = HEADING_RE.match(heading_line.strip())
+    return match.group("title") if match else heading_line[4:].strip()
+
+
+def split_resume(markdown_text: str) -> list[ResumeBlock]:
+    blocks: list[ResumeBlock] = []
+    section = ""
+    seen: dict[str, int] = {}
+    for line in markdown_text.splitlines(keepends=True):
+        key = None
+        if line.startswith("## "):
+            section = line[3:].strip()
+            key = section
+        elif line.startswith("### ") and section:
+            key = f"{section}{KEY_SEPARATOR}{entry_title(line)}"
+        if key is not None:
+            # Two entries with the same title stay separately addressable.
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key} ({seen[key]})"
+            blocks.append(ResumeBlock(key, section, line))
+        elif blocks:
+            blocks[-1].text += line
+        else:
+            blocks.append(ResumeBlock("", "", line))
+    return blocks
+
+
+def join_resume(blocks: list[ResumeBlock]) -> str:
+    return "".join(block.text for block in blocks)
+
+
+def section_keys(blocks: list[ResumeBlock]) -> list[str]:
+    return [block.key for block in blocks if block.key]
+
+
+def resolve_key(name: str, blocks: list[ResumeBlock]) -> Optional[str]:
+    """
+    Maps a section reference from a critique ("Skills", "Work Experience >
+    Role at Company", or a bare entry title as the validator reports it) to
+    a block key. A partial title matches when all of its words (or all of the
+    title's) appear in the other; None if nothing or more than one entry
+    matches, which makes the caller rewrite the whole resume.
+    """
+    name = re.sub(r"\s+", " ", name.replace("#", "").replace("*", "")).strip().lower()
+    if not name:
+        return None
+    for block in blocks:
+        if block.key and block.key.lower() == name:
+            return block.key
+    for block in blocks:
+        title = block.key.split(KEY_SEPARATOR, 1)[-1].lower()
+        if block.key and title == name:
+            return block.key
+    name_words = _WORD_RE.findall(name.split(KEY_SEPARATOR.strip())[-1])
+    matches = set()
+    for block in blocks:
+        if KEY_SEPARATOR not in block.key:
+            continue
+        title_words = _WORD_RE.findall(block.key.split(KEY_SEPARATOR, 1)[-1].lower())
+        shorter, longer = sorted((name_words, title_words), key=len)
+        if set(shorter) <= set(longer) and len("".join(shorter)) >= MIN_PARTIAL_MATCH_CHARS:
+            matches.add(block.key)
+    return matches.pop() if len(matches) == 1 else None
+
+
+def flagged_spans(blocks: list[ResumeBlock], keys: list[str]) -> dict[str, list[int]]:
+    """
+    Block indices to rewrite for each flagged key. A flagged `##` section
+    covers all of its entries, so entries inside it are not rewritten twice.
+    """
+    spans: dict[str, list[int]] = {}
+    sections = {key for key in keys if KEY_SEPARATOR not in key}
+    for key in keys:
+        if key in sections:
+            indices = [i for i, block in enumerate(blocks) if block.section == key]
+        else:
+            indices = [i for i, block in enumerate(blocks) if block.key == key and block.section not in sections]
+        if indices:
+            spans[key] = indices
+    return spans
+
+
+def span_text(blocks: list[ResumeBlock], indices: list[int]) -> str:
+    return "".join(blocks[i].text for i in indices)
+
+
+def splice(blocks: list[ResumeBlock], spans: dict[str, list[int]], rewritten: dict[str, str]) -> str:
+    """Replaces each span with its rewritten text, keeping the original spacing after it."""
+    starts = {indices[0]: key for key, indices in spans.items()}
+    covered = {i for indices in spans.values() for i in indices}
+    parts = []
+    for i, block in enumerate(blocks):
+        if i in starts:
+            key = starts[i]
+            original = span_text(blocks, spans[key])
+            new_text = (rewritten.get(key) or "").strip()
+            if not new_text:
+                parts.append(original)
+                continue
+            trailing = original[len(original.rstrip()):]
+            parts.append(new_text + (trailing or "\n"))
+        elif i not in covered:
+            parts.append(block.text)
+    return "".join(parts)
@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+from backend.relevance import tokenize
+
+REQUIRED_SECTIONS = ["Summary", "Work Experience", "Technical Projects", "Skills", "Education"]
+MAX_BULLETS = {"Work Experience": 3, "Technical Projects": 2}
+# The writer is asked for ~18 words per bullet; past this it wraps to two lines.
+MAX_BULLET_WORDS = 26
+
+HEADING_RE = re.compile(r"^### \*\*(?P<title>[^*]+)\*\* <span>(?P<dates>[^<]+)</span>\s*$")
+_PAGE_RE = re.compile(rb"/Type\s*/Page(?!s)")
+_SKILL_LABEL_RE = re.compile(r"^\s*(?:[-*]\s+)?(?:\*\*[^*]+\*\*:?|[^:,]{1,40}:)\s*")
+
+ERROR_PENALTY = 15
+WARNING_PENALTY = 5
+
+
+@dataclass
+class Issue:
+    code: str
+    severity: str  # "error" or "warning"
+    message: str
+    section: str = ""
+
+
+@dataclass
+class ValidationReport:
+    score: int
+    page_count: Optional[int]
+    issues: list[Issue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[Issue]:
+        return [i for i in self.issues if i.severity == "error"]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def count_pdf_pages(pdf_bytes: bytes) -> int:
+    return len(_PAGE_RE.findall(pdf_bytes))
+
+
+def _split_sections(markdown_text: str) -> dict[str, list[str]]:
+    sections: dict[str, list[str]] = {}
+    current = None
+    for line in markdown_text.splitlines():
+        if line.startswith("## "):
+            current = line[3:].strip()
+            sections[current] = []
+        elif current is not None:
+            sections[current].append(line)
+    return sections
+
+
+def _split_skill_items(line: str) -> list[str]:
+    items, depth, current = [], 0, ""
+    for ch in _SKILL_LABEL_RE.sub("", line, count=1):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth = max(depth - 1, 0)
+        if ch == "," and depth == 0:
+            items.append(current)
+            current = ""
+        else:
+            current += ch
+    items.append(current)
+    return [i.strip(" *-.") for i in items if i.strip(" *-.")]
+
+
+def _profile_vocabulary(profile: dict) -> set[str]:
+    texts = []
+    for skills in (profile.get("skills") or {}).values():
+        texts.extend(skills or [])
+    for work in profile.get("work_experience", []):
+        texts.extend(work.get("achievements", []))
+    for project in profile.get("technical_projects", []):
+        texts.extend(project.get("tech_stack", []))
+        texts.extend(project.get("highlights", []))
+    return set(tokenize(" ".join(texts)))
+
+
+def _check_entries(name: str, lines: list[str], issues: list[Issue]) -> list[str]:
+    """Checks `###` headings and bullets in an experience section; returns entry titles."""
+    titles = []
+    entry, bullets = None, 0
+
+    def close_entry():
+        limit = MAX_BULLETS.get(name)
+        if entry is not None and limit is not None and bullets > limit:
+            issues.append(Issue("too_many_bullets", "error", f"'{entry}' has {bullets} bullets (max {limit}).", entry))
+
+    for line in lines:
+        if line.startswith("### "):
+            close_entry()
+            match = HEADING_RE.match(line.strip())
+            entry = match.group("title") if match else line[4:].strip()
+            bullets = 0
+            titles.append(entry)
+            if not match:
+                issues.append(Issue(
+                    "heading_format", "error",
+                    f"Heading '{line.strip()}' must be '### **Role at Company** <span>Dates</span>'.", entry,
+                ))
+        elif line.lstrip().startswith(("- ", "* ")):
+            bullets += 1
+            words = len(line.split()) - 1
+            if words > MAX_BULLET_WORDS:
+                issues.append(Issue(
+                    "bullet_too_long", "warning",
+                    f"A bullet under '{entry or name}' is {words} words; keep it to one line (~18 words).",
+                    entry or name,
+                ))
+    close_entry()
+    return titles
+
+
+def validate_resume(markdown_text: str, profile: dict, pdf_bytes: Optional[bytes] = None) -> ValidationReport:
+    """
+    Rule-based checks of a resume draft against the profile: section layout,
+    heading format, bullet counts and lengths, role coverage, skills that do not
+    appear anywhere in the profile and, when the draft's rendered PDF is given,
+    its real page count.
+    """
+    issues: list[Issue] = []
+    sections = _split_sections(markdown_text)
+
+    for name in REQUIRED_SECTIONS:
+        if name not in sections:
+            issues.append(Issue("missing_section", "error", f"Missing '## {name}' section.", name))
+
+    for name in MAX_BULLETS:
+        if name in sections:
+            titles = _check_entries(name, sections[name], issues)
+            if name == "Work Experience":
+                heading_text = " ".join(titles).lower()
+                for work in profile.get("work_experience", []):
+                    if work["company"].lower() not in heading_text:
+                        issues.append(Issue(
+                            "missing_role", "error",
+                            f"Role '{work['role']} at {work['company']}' is missing from Work Experience.", name,
+                        ))
+
+    vocabulary = _profile_vocabulary(profile)
+    for line in sections.get("Skills", []):
+        for item in _split_skill_items(line):
+            tokens = tokenize(item)
+            if tokens and not any(t in vocabulary for t in tokens):
+                issues.append(Issue("unknown_skill", "error", f"Skill '{item}' is not in the Master Profile.", "Skills"))
+
+    page_count = None
+    if pdf_bytes is not None:
+        page_count = count_pdf_pages(pdf_bytes)
+        if page_count > 1:
+            issues.append(Issue(
+                "over_one_page", "error",
+                f"Resume renders to {page_count} pages; cut it down to one page.", "",
+            ))
+
+    penalty = sum(ERROR_PENALTY if i.severity == "error" else WARNING_PENALTY for i in issues)
+    return ValidationReport(score=max(100 - penalty, 0), page_count=page_count, issues=issues)
+
+
+def revision_instructions(report: ValidationReport) -> str:
+    return " ".join(issue.message for issue in report.issues)
@@ -0,0 +1,245 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Optional
+
+from backend.agent_loader import load_agents
+from backend.profile_store import ProfileSnapshot, ProfileStore
+
+
+class RunNotFound(Exception):
+    """Raised for a run ID with no checkpoints."""
+
+
+class RunStateError(Exception):
+    """Raised when an operation does not fit the run's current state (busy, finished, unfinished)."""
+
+
+class RunFailed(Exception):
+    """Wraps an error raised while a run was executing, keeping its run ID so the client can resume it."""
+
+    def __init__(self, run_id: str, error: Exception):
+        super().__init__(str(error))
+        self.run_id = run_id
+        # Set here rather than relying on `raise ... from`, so the HTTP layer
+        # can map the original error (e.g. a rate limit) however it is raised.
+        self.__cause__ = error
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+def run_config(run_id: str, callbacks: Optional[list] = None, profile: Optional[ProfileSnapshot] = None) -> dict:
+    configurable = {"thread_id": run_id}
+    if profile is not None:
+        # Read by the agent nodes instead of the state, so it is not checkpointed.
+        configurable["profile"] = profile
+    return {"configurable": configurable, "callbacks": callbacks or []}
+
+
+class RunStore:
+    """
+    Agent runs checkpointed to SQLite after every graph step, keyed by run ID
+    (the LangGraph thread_id).
+
+    A run that failed or was interrupted part-way keeps the output of every
+    node that finished, so resuming it only re-executes the remaining nodes.
+    Finished runs can have their cover letter rewritten or get one more
+    review round without redoing JD analysis and experience mapping.
+
+    Checkpoints hold the profile's version, not the profile; it is looked up
+    in `profiles` whenever a run continues. Runs untouched for `ttl_seconds`,
+    and the oldest beyond `max_runs`, are deleted after each operation.
+    """
+
+    def __init__(self, path: str, profiles: ProfileStore, max_runs: int = 500, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.profiles = profiles
+        self.max_runs = max_runs
+        self.ttl_seconds = ttl_seconds
+        self.workflow = None
+        self._agents = None
+        self._conn = None
+        self._saver = None
+        self._busy: set[str] = set()
+        self._start_lock = asyncio.Lock()
+
+    async def start(self):
+        """
+        Loads the agents and opens the checkpoint database. Called by the app's
+        startup warm-up, and by every operation in case that has not finished.
+        """
+        async with self._start_lock:
+            if self.workflow is not None:
+                return
+            agents = await load_agents()
+            # Imported with the agents, so loaded by now.
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # The saver binds to the running event loop, so it is created here
+            # rather than at import time.
+            self._conn = await aiosqlite.connect(self.path)
+            saver = AsyncSqliteSaver(self._conn)
+            await saver.setup()
+            await self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+            )
+            # Threads checkpointed before runs were tracked age from now.
+            await self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, updated_at) SELECT DISTINCT thread_id, ? FROM checkpoints",
+                (time.time(),),
+            )
+            await self._conn.commit()
+            self._saver = saver
+            self._agents = agents
+            self.workflow = agents.compile_checkpointed(saver)
+            await self.prune()
+
+    async def stop(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+            self._saver = None
+            self.workflow = None
+
+    async def state(self, run_id: str):
+        await self.start()
+        snapshot = await self.workflow.aget_state(run_config(run_id))
+        if not snapshot.values:
+            raise RunNotFound(run_id)
+        return snapshot
+
+    def _claim(self, run_id: str):
+        if run_id in self._busy:
+            raise RunStateError(f"Run {run_id} is already being processed")
+        self._busy.add(run_id)
+
+    async def _release(self, run_id: str):
+        self._busy.discard(run_id)
+        await self.prune()
+
+    async def _touch(self, run_id: str):
+        async with self._saver.lock:
+            await self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, updated_at) VALUES (?, ?)", (run_id, time.time())
+            )
+            await self._conn.commit()
+
+    async def prune(self) -> int:
+        """Deletes runs older than the TTL and the oldest beyond max_runs, skipping busy ones. Returns how many."""
+        if self._saver is None:
+            return 0
+        async with self._saver.lock:
+            async with self._conn.execute(
+                "SELECT run_id FROM runs WHERE updated_at < ? "
+                "UNION SELECT run_id FROM (SELECT run_id FROM runs ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (time.time() - self.ttl_seconds, self.max_runs),
+            ) as cursor:
+                expired = [run_id for (run_id,) in await cursor.fetchall() if run_id not in self._busy]
+        for run_id in expired:
+            await self._saver.adelete_thread(run_id)
+        if expired:
+            async with self._saver.lock:
+                await self._conn.executemany("DELETE FROM runs WHERE run_id = ?", [(run_id,) for run_id in expired])
+                await self._conn.commit()
+        return len(expired)
+
+    def _config(self, run_id: str, values: dict, callbacks: Optional[list] = None) -> dict:
+        """run_config for `run_id` with the profile version the run was started with."""
+        if "profile" in values:
+            # Checkpointed before the profile was moved out of the state.
+            return run_config(run_id, callbacks)
+        version = values.get("profile_version", "")
+        profile = self.profiles.get_version(version)
+        if profile is None:
+            raise RunStateError(
+                f"Run {run_id} was started with profile version {version}, which is no longer loaded; start a new run"
+            )
+        return run_config(run_id, callbacks, profile)
+
+    async def run(self, run_id: str, initial_state: dict, callbacks: Optional[list] = None) -> dict:
+        """
+        Runs the graph under `run_id`. If the run already has checkpoints it
+        continues from the last completed step instead of starting over, and a
+        finished run just returns its final state.
+        """
+        await self.start()
+        self._claim(run_id)
+        try:
+            snapshot = await self.workflow.aget_state(run_config(run_id))
+            if snapshot.values and not snapshot.next:
+                return snapshot.values
+            config = self._config(run_id, snapshot.values or initial_state, callbacks)
+            await self._touch(run_id)
+            return await self.workflow.ainvoke(None if snapshot.values else initial_state, config)
+        finally:
+            await self._release(run_id)
+
+    async def stream(self, run_id: str, initial_state: dict, callbacks: Optional[list] = None):
+        """Runs a new graph under `run_id`, yielding the (event, data) pairs of stream_workflow_events."""
+        await self.start()
+        self._claim(run_id)
+        try:
+            config = self._config(run_id, initial_state, callbacks)
+            await self._touch(run_id)
+            async for event in self._agents.stream_workflow_events(initial_state, config, self.workflow):
+                yield event
+        finally:
+            await self._release(run_id)
+
+    async def resume(self, run_id: str, callbacks: Optional[list] = None) -> dict:
+        """Re-executes the nodes a failed or interrupted run did not complete."""
+        self._claim(run_id)
+        try:
+            snapshot = await self.state(run_id)
+            if not snapshot.next:
+                raise RunStateError(f"Run {run_id} has already finished")
+            config = self._config(run_id, snapshot.values, callbacks)
+            await self._touch(run_id)
+            return await self.workflow.ainvoke(None, config)
+        finally:
+            await self._release(run_id)
+
+    async def _apply_node(self, run_id: str, node: str, fn, values: dict, callbacks: Optional[list]) -> dict:
+        """Runs one node function outside the graph and records its output as a write by `node`."""
+        from langchain_core.runnables import RunnableLambda
+
+        config = {
+            **self._config(run_id, values, callbacks),
+            "run_name": node,
+            "metadata": {"langgraph_node": node},
+        }
+        await self._touch(run_id)
+        updates = await RunnableLambda(fn).ainvoke(values, config)
+        await self.workflow.aupdate_state(run_config(run_id), updates, as_node=node)
+        return {**values, **updates}
+
+    async def _finished_values(self, run_id: str) -> dict:
+        snapshot = await self.state(run_id)
+        if snapshot.next:
+            raise RunStateError(f"Run {run_id} has not finished; resume it first")
+        return snapshot.values
+
+    async def regenerate_cover_letter(self, run_id: str, callbacks: Optional[list] = None) -> dict:
+        self._claim(run_id)
+        try:
+            values = await self._finished_values(run_id)
+            return await self._apply_node(
+                run_id, "ghostwrite_cover_letter", self._agents.ghostwrite_cover_letter, values, callbacks
+            )
+        finally:
+            await self._release(run_id)
+
+    async def review_again(self, run_id: str, callbacks: Optional[list] = None) -> dict:
+        """One more revise + review round on the stored drafts, using the last critique's instructions."""
+        self._claim(run_id)
+        try:
+            values = await self._finished_values(run_id)
+            values = await self._apply_node(run_id, "revise_resume", self._agents.revise_resume, values, callbacks)
+            return await self._apply_node(run_id, "review_quality", self._agents.review_quality, values, callbacks)
+        finally:
+            await self._release(run_id)
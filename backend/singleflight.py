@@ -0,0 +1,34 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable
+
+
+def request_key(job_description: str, profile_version: str) -> str:
+    """Hash of the whitespace-normalized job description and the profile version."""
+    normalized = " ".join(job_description.split())
+    return hashlib.sha256(f"{profile_version}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task and receive the same result (or
+    exception). A caller being cancelled, e.g. because its client disconnected,
+    does not cancel the shared task for the others.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def inflight(self) -> int:
+        return len(self._inflight)
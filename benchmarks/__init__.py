@@ -0,0 +1 @@
+"""Offline benchmarks for the backend. Run modules with `python -m benchmarks.<name>`."""
@@ -0,0 +1,136 @@
+"""
+Deterministic stand-in for the Gemini chat model, for benchmarking the agent
+graph without an API key or network access.
+"""
+import asyncio
+import json
+import random
+import re
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from benchmarks.fixtures import SAMPLE_COVER_LETTER, sample_resume_markdown
+
+
+def canned_responses(profile: dict, match_score: int = 92) -> dict[str, str]:
+    """Replies keyed by a phrase that identifies each agent prompt."""
+    first_role = profile["work_experience"][0]
+    entries = [w["company"] for w in profile["work_experience"]]
+    entries += [p["title"] for p in profile["technical_projects"][:3]]
+    return {
+        "JD Strategist": json.dumps({
+            "persona": "Systems-Heavy Backend Engineer",
+            "core_pain_points": ["real-time data ingestion", "LLM reliability"],
+            "must_have_skills": ["Python", "FastAPI", "Kafka", "PostgreSQL", "AWS", "Docker"],
+            "nice_to_have_skills": ["C++", "Spark", "LangGraph"],
+            "strategic_focus": "emphasize end-to-end delivery of data-heavy backend services",
+        }),
+        "Experience Matcher": json.dumps({
+            "selected_entries": [
+                {"id": entry, "reasoning": "Matches the JD's backend and data requirements.", "key_metrics_to_include": []}
+                for entry in entries
+            ],
+        }),
+        "Technical Resume Writer": sample_resume_markdown(profile),
+        "Career Consultant": SAMPLE_COVER_LETTER,
+        "Quality Critic": json.dumps({
+            "match_score": match_score,
+            "issues_found": [],
+            "revision_instructions": "" if match_score >= 90 else "Shorten the first role's bullets and add metrics.",
+            "flagged_sections": [] if match_score >= 90 else [{
+                "section": f"Work Experience > {first_role['role']} at {first_role['company']}",
+                "instruction": "Shorten the bullets and add metrics.",
+            }],
+        }),
+    }
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Answers each agent prompt with a canned reply after `latency` seconds
+    (plus up to `jitter` seconds drawn from a seeded RNG). Replies report
+    usage_metadata with the prompt's estimated input tokens and either
+    `output_tokens` or the reply's estimated size. Streaming splits the reply
+    into `stream_chunks` pieces spread over the same latency.
+    """
+
+    responses: dict[str, str]
+    latency: float = 0.5
+    jitter: float = 0.0
+    output_tokens: int = 0
+    stream_chunks: int = 20
+    model_name: str = "fake-gemini"
+    seed: int = 0
+    _rng: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "latency": self.latency}
+
+    def _get_ls_params(self, stop: Optional[list[str]] = None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_model_name"] = self.model_name
+        return params
+
+    def _reply(self, messages) -> tuple[str, dict]:
+        prompt = "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+        section = re.search(r"<<<\n(.*?)\n>>>", prompt, re.S)
+        candidates = re.findall(r"<<<CANDIDATE (\d+)>>>", prompt)
+        if "Resume Section Editor" in prompt and section:
+            # Section rewrites echo the section back unchanged.
+            text = section.group(1)
+        elif candidates:
+            # Batched critique: every candidate gets the single critic's
+            # review, one point better per candidate so the last one wins.
+            review = json.loads(self.responses["Quality Critic"])
+            text = json.dumps({"reviews": [
+                {**review, "candidate": int(n), "match_score": min(review["match_score"] + i, 100)}
+                for i, n in enumerate(candidates)
+            ]})
+        else:
+            for marker in ("Career Consultant", "JD Strategist", "Experience Matcher", "Quality Critic", "Technical Resume Writer"):
+                if marker in prompt:
+                    text = self.responses[marker]
+                    break
+            else:
+                text = ""
+        input_tokens = len(prompt) // 4
+        output_tokens = self.output_tokens or len(text) // 4
+        usage = {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+        return text, usage
+
+    def _delay(self) -> float:
+        return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError("FakeChatModel is async-only; use ainvoke/astream.")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text, usage = self._reply(messages)
+        await asyncio.sleep(self._delay())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        text, usage = self._reply(messages)
+        chunks = max(self.stream_chunks, 1)
+        size = max(len(text) // chunks, 1)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        pause = self._delay() / len(pieces)
+        for i, piece in enumerate(pieces):
+            await asyncio.sleep(pause)
+            last = i == len(pieces) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage if last else None))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
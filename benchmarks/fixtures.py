@@ -0,0 +1,73 @@
+import json
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_PATH = os.path.join(REPO_ROOT, "MasterProfile.json")
+
+
+def load_profile() -> dict:
+    with open(PROFILE_PATH, "r") as f:
+        return json.load(f)
+
+
+def sample_resume_markdown(profile: dict) -> str:
+    """A full one-page resume in the ghostwriter's Markdown format, built from the real profile."""
+    lines = [
+        "## Summary",
+        "AI engineer and data scientist building agentic LLM systems, real-time data pipelines and backend services.",
+        "",
+        "## Work Experience",
+    ]
+    for work in profile["work_experience"]:
+        lines += [
+            f"### **{work['role']} at {work['company']}** <span>{work['dates']}</span>",
+            f"*{work['location']}*",
+            "",
+        ]
+        lines += [f"- {a}" for a in work["achievements"][:3]]
+        lines.append("")
+    lines.append("## Technical Projects")
+    for project in profile["technical_projects"]:
+        lines += [
+            f"### **{project['title']}** <span>{', '.join(project['tech_stack'][:3])}</span>",
+            "",
+        ]
+        lines += [f"- {h}" for h in project["highlights"][:2]]
+        lines.append("")
+    lines.append("## Skills")
+    for category, skills in profile["skills"].items():
+        if skills:
+            lines.append(f"**{category.replace('_', ' ').title()}:** {', '.join(skills)}")
+    lines += ["", "## Education"]
+    for edu in profile["education"]:
+        lines += [f"### **{edu['institution']}** <span>{edu['dates']}</span>", f"*{edu['degree']}, GPA {edu['gpa']}*", ""]
+    return "\n".join(lines)
+
+
+SAMPLE_COVER_LETTER = """Hello Platform Engineering Team,
+
+Your recent focus on reliable real-time data infrastructure caught my attention because it is the problem I spent my internship at Finz solving: a FastAPI and Kafka pipeline that normalizes financial data from Stripe and QuickBooks for real-time cashflow analysis.
+
+At BU BIT Lab I built evaluation harnesses for LLM systems, which taught me to treat model output like any other production dependency: measured, versioned and monitored.
+
+I also built the AI Career Suite, a LangGraph workflow that turns a job description into a tailored resume and cover letter. It is the kind of end-to-end tool I enjoy building, and I would bring the same ownership to your team."""
+
+
+SAMPLE_JOB_DESCRIPTION = """Backend Engineer, Data Platform
+
+We are a Series B fintech startup building real-time cashflow analytics for small businesses.
+You will design and own the services that ingest payment and accounting data and serve it to
+our forecasting models.
+
+Requirements:
+- 2+ years building backend services in Python (FastAPI, Flask or Django)
+- Experience with streaming systems such as Kafka and with PostgreSQL
+- Cloud experience on AWS (Lambda, S3, ECS) and Docker
+- Comfortable working with LLM APIs and evaluation of model output
+
+Nice to have:
+- C++ or systems programming background
+- Spark or other distributed data processing
+- Experience with LangChain or LangGraph
+
+We move fast, value end-to-end ownership and ship to production every day."""
@@ -0,0 +1,116 @@
+"""
+Import-time report for the backend. Each module is imported in a fresh
+interpreter under `python -X importtime`, and the report shows its total cost,
+the backend modules it pulls in and the heaviest third-party packages.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 800 --top 15
+
+It also checks that importing backend.main leaves the agent graph, the Gemini
+SDK and the PDF engines unloaded, since those load in the background after
+startup. The exit status is 1 if that check fails or backend.main takes
+longer than --budget-ms, so it can guard against cold-start regressions in CI.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+DEFAULT_MODULES = ("backend.main", "backend.agents", "backend.pdf_generator", "backend.reportlab_engine")
+
+# Loaded lazily by the API; importing backend.main must not pull these in.
+DEFERRED_MODULES = (
+    "backend.agents",
+    "langgraph",
+    "langchain_google_genai",
+    "google.genai",
+    "xhtml2pdf",
+    "reportlab",
+    "pypdf",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    """{imported module: (self µs, cumulative µs)} for importing `module` in a fresh interpreter."""
+    stderr = _run(f"import {module}", importtime=True).stderr
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def best_of(module: str, repeat: int) -> dict[str, tuple[int, int]]:
+    # Import times are noisy; keep the fastest run of the target module.
+    runs = [measure(module) for _ in range(repeat)]
+    return min(runs, key=lambda timings: timings.get(module, (0, 0))[1])
+
+
+def loaded_deferred_modules() -> list[str]:
+    code = (
+        "import sys, backend.main\n"
+        f"print('\\n'.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    return [line for line in _run(code).stdout.splitlines() if line]
+
+
+def report(module: str, timings: dict[str, tuple[int, int]], top: int):
+    total = timings.get(module, (0, 0))[1]
+    print(f"\n{module}: {total / 1000:.0f} ms")
+    backend = sorted(
+        ((name, cumulative) for name, (_, cumulative) in timings.items() if name.startswith("backend.") and name != module),
+        key=lambda item: -item[1],
+    )
+    if backend:
+        print(f"  {'backend module':<40} {'cumulative ms':>14}")
+        for name, cumulative in backend:
+            print(f"  {name:<40} {cumulative / 1000:>14.1f}")
+    packages = defaultdict(int)
+    for name, (self_us, _) in timings.items():
+        if not name.startswith("backend"):
+            packages[name.split(".")[0]] += self_us
+    print(f"  {'package (self time)':<40} {'ms':>14}")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<40} {self_us / 1000:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--repeat", type=int, default=3, help="fresh-interpreter runs per module (fastest is kept)")
+    parser.add_argument("--top", type=int, default=10, help="third-party packages listed per module")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if importing backend.main takes longer")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        timings = best_of(module, args.repeat)
+        report(module, timings, args.top)
+        if module == "backend.main" and args.budget_ms is not None:
+            total_ms = timings.get(module, (0, 0))[1] / 1000
+            if total_ms > args.budget_ms:
+                print(f"  FAIL: {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+                failed = True
+
+    loaded = loaded_deferred_modules()
+    if loaded:
+        print(f"\nFAIL: importing backend.main loads {', '.join(loaded)}; these should load lazily")
+        failed = True
+    else:
+        print("\nbackend.main defers the agent graph, Gemini SDK and PDF engines")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compares per-document render latency and Python memory of the two PDF engines.
+
+    python -m benchmarks.pdf_engines --runs 30
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from backend.pdf_generator import PDFGenerator
+from backend.reportlab_engine import ReportLabGenerator
+from benchmarks.fixtures import SAMPLE_COVER_LETTER, load_profile, sample_resume_markdown
+
+
+def _measure(render, runs: int) -> dict:
+    render()  # warm-up: font loading, template compilation
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        render()
+        latencies.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+        "peak_kib": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    profile = load_profile()
+    resume = sample_resume_markdown(profile)
+    engines = {"xhtml2pdf": PDFGenerator(), "reportlab": ReportLabGenerator()}
+
+    print(f"{'engine':<10} {'document':<13} {'p50 ms':>8} {'p95 ms':>8} {'peak KiB':>9}")
+    for name, gen in engines.items():
+        cases = {
+            "resume": lambda: gen.generate_resume_from_markdown(resume, profile),
+            "cover_letter": lambda: gen.generate_cover_letter(profile, SAMPLE_COVER_LETTER, "Acme", "January 1, 2026"),
+        }
+        for document, render in cases.items():
+            r = _measure(render, args.runs)
+            print(f"{name:<10} {document:<13} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['peak_kib']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Offline load test of the agent graph and the HTTP API, with Gemini replaced by
+a deterministic fake chat model (benchmarks/fake_llm.py) and the real
+MasterProfile.json. Reports p50/p95 latency and requests/sec per concurrency
+level, plus where the time goes per graph node.
+
+    python -m benchmarks.throughput --concurrency 1,4,16 --requests 32 --latency 0.3
+
+The LLM response cache and the near-duplicate JD index are off unless
+--llm-cache / --jd-index are given; every request uses a distinct job
+description so single-flight and the caches do not collapse the load. PDF_RENDER_WORKERS and the other backend settings are read
+from the environment as usual.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections import defaultdict
+
+from benchmarks.fixtures import SAMPLE_COVER_LETTER, SAMPLE_JOB_DESCRIPTION, load_profile, sample_resume_markdown
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def _drive(concurrency: int, requests: int, call) -> tuple[list[float], float, list]:
+    """Runs call(i) for i in range(requests), at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, results = [], []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            results.append(await call(i))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, time.perf_counter() - start, results
+
+
+def _print_level(target: str, concurrency: int, latencies: list[float], elapsed: float):
+    print(
+        f"{target:<12} {concurrency:>5} {len(latencies):>6} {statistics.median(latencies) * 1000:>9.0f} "
+        f"{_percentile(latencies, 0.95) * 1000:>9.0f} {len(latencies) / elapsed:>8.2f}"
+    )
+
+
+def _print_node_split(title: str, breakdowns: list[dict]):
+    per_node = defaultdict(list)
+    for breakdown in breakdowns:
+        for entry in breakdown["nodes"]:
+            per_node[entry["node"]].append(entry["seconds"])
+    total = sum(sum(v) for v in per_node.values()) or 1.0
+    print(f"\n{title}")
+    print(f"{'node':<24} {'runs':>5} {'mean ms':>9} {'p95 ms':>9} {'share':>7}")
+    for node, seconds in sorted(per_node.items(), key=lambda kv: -sum(kv[1])):
+        print(
+            f"{node:<24} {len(seconds):>5} {statistics.mean(seconds) * 1000:>9.0f} "
+            f"{_percentile(seconds, 0.95) * 1000:>9.0f} {sum(seconds) / total:>6.0%}"
+        )
+
+
+def _job_description(i: int) -> str:
+    return f"{SAMPLE_JOB_DESCRIPTION}\n\nRequisition #{i:05d}"
+
+
+async def run(args):
+    # Imported here so the environment set up in main() is seen by the backend.
+    import httpx
+
+    from backend import agents, main as app_module
+    from backend.metrics import RunMetrics
+    from benchmarks.fake_llm import FakeChatModel, canned_responses
+
+    profile = load_profile()
+    agents.llm = FakeChatModel(
+        responses=canned_responses(profile, match_score=args.match_score),
+        latency=args.latency,
+        jitter=args.jitter,
+        output_tokens=args.output_tokens,
+        seed=args.seed,
+        cache=agents.llm_cache if args.llm_cache else False,
+    )
+    snapshot = app_module.profile_store.get()
+    levels = [int(c) for c in args.concurrency.split(",")]
+    header = f"{'target':<12} {'conc':>5} {'reqs':>6} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>8}"
+
+    workflow_breakdowns = []
+    print(f"fake LLM latency {args.latency:.3f}s (+{args.jitter:.3f}s jitter), {args.requests} requests per level\n")
+    print(header)
+    for concurrency in levels:
+        async def call(i: int, offset=concurrency * 100000):
+            run_metrics = RunMetrics()
+            await agents.agent_workflow.ainvoke(
+                app_module._initial_state(_job_description(offset + i), snapshot),
+                config={"configurable": {"profile": snapshot}, "callbacks": [run_metrics]},
+            )
+            run_metrics.finish()
+            return run_metrics.breakdown()
+
+        latencies, elapsed, results = await _drive(concurrency, args.requests, call)
+        workflow_breakdowns += results
+        _print_level("workflow", concurrency, latencies, elapsed)
+
+    app = app_module.app
+    generate_breakdowns = []
+    async with app.router.lifespan_context(app):
+        # Measure a warm server: load what startup would otherwise warm up in
+        # the background while the first requests run.
+        await app_module.run_store.start()
+        await asyncio.to_thread(app_module.pdf_pool.start)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for concurrency in levels:
+                async def call(i: int, offset=concurrency * 100000 + 50000):
+                    response = await client.post(
+                        "/api/v1/generate", params={"timings": "true"},
+                        json={"job_description": _job_description(offset + i)},
+                    )
+                    response.raise_for_status()
+                    return response.json()["timings"]
+
+                latencies, elapsed, results = await _drive(concurrency, args.requests, call)
+                generate_breakdowns += results
+                _print_level("/generate", concurrency, latencies, elapsed)
+
+            if not args.skip_export:
+                resume = sample_resume_markdown(profile)
+                for concurrency in levels:
+                    async def call(i: int, offset=concurrency * 100000):
+                        # A distinct company name per request defeats the PDF cache.
+                        pdf_type = "resume" if i % 2 == 0 else "cover_letter"
+                        response = await client.post("/api/v1/export-pdf", json={
+                            "content": resume if pdf_type == "resume" else SAMPLE_COVER_LETTER,
+                            "type": pdf_type,
+                            "company_name": f"Company {offset + i}",
+                            "engine": args.engine,
+                        })
+                        response.raise_for_status()
+
+                    latencies, elapsed, _ = await _drive(concurrency, args.requests, call)
+                    _print_level("/export-pdf", concurrency, latencies, elapsed)
+
+    _print_node_split("agent_workflow time per node (all levels)", workflow_breakdowns)
+    _print_node_split("/generate time per node (all levels)", generate_breakdowns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=16, help="requests per concurrency level")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake LLM seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds per call (seeded)")
+    parser.add_argument("--output-tokens", type=int, default=0, help="reported output tokens per call (0: from reply size)")
+    parser.add_argument("--match-score", type=int, default=92, help="critic score; below 90 triggers a revision round")
+    parser.add_argument("--engine", default=None, help="PDF engine for /export-pdf (default: PDF_ENGINE)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache enabled")
+    parser.add_argument("--candidates", type=int, default=None, help="resume drafts per run (RESUME_CANDIDATES)")
+    parser.add_argument("--jd-index", action="store_true", help="reuse analysis of near-duplicate JDs")
+    parser.add_argument("--skip-export", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LLM_CACHE_ENABLED", "true" if args.llm_cache else "false")
+    # The JDs only differ by requisition number, so the near-duplicate index
+    # would skip analyze_jd and map_experience for all but the first request.
+    os.environ.setdefault("JD_INDEX_ENABLED", "true" if args.jd_index else "false")
+    if args.candidates is not None:
+        os.environ["RESUME_CANDIDATES"] = str(args.candidates)
+    # Batch jobs are not exercised; keep the benchmark's job store out of .cache/.
+    os.environ.setdefault("JOB_STORE_PATH", ":memory:")
+    os.environ.setdefault("WARM_UP_ON_STARTUP", "false")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
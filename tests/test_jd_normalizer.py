@@ -0,0 +1,146 @@
+import unittest
+
+from backend.jd_normalizer import normalize_job_description
+
+PRIVACY_ENGINEER_JD = """\
+Privacy Engineer
+
+## Responsibilities
+- Build tooling that enforces our privacy policy across 200 services
+- Partner with legal on E-Verify and pay transparency reporting systems
+- Review data flows for new product launches
+
+## Requirements
+- 4+ years of backend engineering in Python or Go
+- Experience with data classification and retention systems
+
+Acme is an equal opportunity employer. All qualified applicants will receive consideration without regard to race, sex or age.
+
+## Benefits
+- Unlimited PTO
+- 401(k) matching
+"""
+
+
+class NormalizeJobDescriptionTests(unittest.TestCase):
+    def test_keeps_bullets_that_mention_boilerplate_terms(self):
+        normalized = normalize_job_description(PRIVACY_ENGINEER_JD)
+        self.assertIn("- Build tooling that enforces our privacy policy across 200 services", normalized)
+        self.assertIn("- Partner with legal on E-Verify and pay transparency reporting systems", normalized)
+
+    def test_drops_unheaded_eeo_paragraph_after_a_list(self):
+        normalized = normalize_job_description(PRIVACY_ENGINEER_JD)
+        self.assertNotIn("equal opportunity employer", normalized)
+        self.assertIn("- Experience with data classification and retention systems", normalized)
+
+    def test_drops_boilerplate_sections(self):
+        normalized = normalize_job_description(PRIVACY_ENGINEER_JD)
+        self.assertNotIn("Unlimited PTO", normalized)
+        self.assertNotIn("Benefits", normalized)
+
+    def test_keeps_role_prose_that_mentions_boilerplate_terms(self):
+        jd = (
+            "About the role\n"
+            "You will own our privacy policy tooling and the reasonable accommodation request portal.\n\n"
+            "Requirements\n"
+            "- Python\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertIn("privacy policy tooling", normalized)
+
+    def test_drops_boilerplate_prose_outside_content_sections(self):
+        jd = (
+            "Senior Data Engineer at Acme\n"
+            "We do not accept unsolicited resumes from recruitment agencies.\n\n"
+            "Requirements\n"
+            "- 5+ years building data pipelines with Spark and Airflow\n"
+            "- Strong SQL and data modelling skills\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertNotIn("unsolicited resumes", normalized)
+        self.assertIn("- Strong SQL and data modelling skills", normalized)
+
+    def test_inline_content_label_ends_skip_section(self):
+        jd = (
+            "Requirements\n"
+            "- 5+ years building data pipelines with Python and SQL\n"
+            "- Experience operating Airflow in production\n\n"
+            "Equal Opportunity Employer\n"
+            "We celebrate diversity and are committed to an inclusive environment.\n"
+            "Nice to have: Spark\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertIn("Nice to have: Spark", normalized)
+        self.assertNotIn("celebrate diversity", normalized)
+
+    def test_keeps_first_about_paragraph_only(self):
+        jd = (
+            "About Acme\n"
+            "Acme builds payment infrastructure for small businesses.\n\n"
+            "Founded in 2012, we have offices in six countries and love ping-pong.\n\n"
+            "Responsibilities\n"
+            "- Design and operate the ledger service that records every payment\n"
+            "- Mentor two junior engineers on the payments team\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertIn("Acme builds payment infrastructure", normalized)
+        self.assertNotIn("ping-pong", normalized)
+        self.assertIn("- Mentor two junior engineers on the payments team", normalized)
+
+    def test_keeps_plain_headings_after_a_benefits_section(self):
+        jd = (
+            "Responsibilities\n"
+            "- Train and ship ranking models for search\n\n"
+            "Perks & Benefits\n"
+            "- Unlimited PTO\n"
+            "- Home office stipend\n\n"
+            "Must have\n"
+            "- 5+ years of PyTorch\n"
+            "- Production Kubernetes experience\n\n"
+            "Nice-to-haves\n"
+            "- Experience with Ray\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertNotIn("Unlimited PTO", normalized)
+        for line in ("Must have", "- 5+ years of PyTorch", "- Production Kubernetes experience", "- Experience with Ray"):
+            self.assertIn(line, normalized)
+
+    def test_keeps_role_prose_after_about_us(self):
+        jd = (
+            "About us\n"
+            "Acme builds payment infrastructure for small businesses.\n\n"
+            "Founded in 2012, we have offices in six countries.\n\n"
+            "We're hiring a Senior Backend Engineer to own our Kafka-based ledger service end to end.\n\n"
+            "- Design the settlement pipeline\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertNotIn("Founded in 2012", normalized)
+        self.assertIn("We're hiring a Senior Backend Engineer to own our Kafka-based ledger service", normalized)
+        self.assertIn("- Design the settlement pipeline", normalized)
+
+    def test_heading_after_about_us_ends_the_section(self):
+        jd = (
+            "About us\n"
+            "Acme builds payment infrastructure for small businesses.\n\n"
+            "Our investors include several well-known funds.\n\n"
+            "What we're looking for\n"
+            "- Go and Postgres in production\n"
+        )
+        normalized = normalize_job_description(jd)
+        self.assertNotIn("investors", normalized)
+        self.assertIn("What we're looking for\n- Go and Postgres in production", normalized)
+
+    def test_unifies_bullets_and_whitespace(self):
+        jd = "Responsibilities\n•  Ship   features\n* Fix bugs\n\n\n\n**Requirements**\n● Python\n"
+        self.assertEqual(
+            normalize_job_description(jd),
+            "Responsibilities\n- Ship features\n- Fix bugs\n\n**Requirements**\n- Python",
+        )
+
+    def test_falls_back_when_everything_is_boilerplate(self):
+        jd = "Acme is an equal opportunity employer and participates in E-Verify."
+        self.assertEqual(normalize_job_description(jd), jd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from backend.resume_sections import resolve_key, split_resume
+
+RESUME = """\
+## Summary
+Backend engineer building data platforms.
+
+## Work Experience
+### **AI Engineering Intern at Finz** <span>Dec 2025 - Jan 2026</span>
+
+- Built a FastAPI and Kafka ETL pipeline.
+
+### **Research Assistant at BU BIT Lab** <span>2025</span>
+
+- Evaluated LLM outputs with LangSmith.
+
+## Skills
+**Languages:** Python, SQL
+"""
+
+FINZ = "Work Experience > AI Engineering Intern at Finz"
+
+
+class ResolveKeyTests(unittest.TestCase):
+    def setUp(self):
+        self.blocks = split_resume(RESUME)
+
+    def test_exact_keys_and_titles(self):
+        self.assertEqual(resolve_key("Skills", self.blocks), "Skills")
+        self.assertEqual(resolve_key(FINZ, self.blocks), FINZ)
+        self.assertEqual(resolve_key("**AI Engineering Intern at Finz**", self.blocks), FINZ)
+
+    def test_partial_title_on_whole_words(self):
+        self.assertEqual(resolve_key("Work Experience > AI Engineering Intern", self.blocks), FINZ)
+        self.assertEqual(resolve_key("Finz", self.blocks), FINZ)
+        self.assertEqual(resolve_key("AI Engineering Intern at Finz (Remote)", self.blocks), FINZ)
+
+    def test_short_or_partial_words_do_not_match(self):
+        self.assertIsNone(resolve_key("a", self.blocks))
+        self.assertIsNone(resolve_key("Fin", self.blocks))
+        self.assertIsNone(resolve_key("Engineer", self.blocks))
+
+    def test_ambiguous_reference_returns_none(self):
+        blocks = split_resume(RESUME.replace("Research Assistant at BU BIT Lab", "AI Engineering Intern at Acme"))
+        self.assertIsNone(resolve_key("AI Engineering Intern", blocks))
+        self.assertEqual(resolve_key("Acme", blocks), "Work Experience > AI Engineering Intern at Acme")
+
+
+if __name__ == "__main__":
+    unittest.main()